@@ -0,0 +1,12 @@
+"""
+ownchess - a chessboard with move generation, perft and a search engine.
+
+Importing the package has no side effects: the interactive prompt lives in
+ownchess.cli (python -m ownchess), the UCI engine in ownchess.uci and the
+perft regression suite in ownchess.perftsuite.
+"""
+from .board import (Board, MoveList, encode_move, decode_move,
+                    EMPTY, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING,
+                    WHITE, BLACK, TYPE_MASK, COLOUR_MASK,
+                    MOVE_QUIET, MOVE_CASTLING, MOVE_EN_PASSANT, MOVE_PROMOTION)
+from .search import Searcher, SearchResult
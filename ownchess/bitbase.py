@@ -0,0 +1,242 @@
+from typing import List, Optional, Tuple
+from time import time
+import mmap
+import os
+import sys
+
+from .board import Board, PAWN, KING, WHITE, BLACK, TYPE_MASK, COLOUR_MASK
+
+
+# King and pawn against king: one bit per position, set if the side with
+# the pawn wins. Positions are normalised to a White pawn on files a-d and
+# indexed by (side to move, pawn square, strong king, weak king), the side
+# to move being 0 if it is the side with the pawn
+KPK_PAWN_SQUARES = 24 # ranks 2-7, files a-d
+KPK_POSITIONS = 2 * KPK_PAWN_SQUARES * 64 * 64
+KPK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'kpk.bin')
+
+# Position results during generation
+_UNKNOWN = 0
+_WIN = 1
+_DRAW = 2
+_INVALID = 3
+
+# Memory-mapped bitbase, loaded on first probe
+_kpk_data = None
+
+
+def kpk_index(weak_to_move: int, pawn_sq: int, strong_king: int, weak_king: int) -> int:
+    """Return the index of a normalised KPK position (White pawn on files a-d)."""
+
+    pawn_index = (pawn_sq // 8 - 1) * 4 + pawn_sq % 8
+    return ((weak_to_move * KPK_PAWN_SQUARES + pawn_index) * 64 + strong_king) * 64 + weak_king
+
+
+def _decode_kpk_index(index: int) -> Tuple[int, int, int, int]:
+    """Internal function. Inverse of kpk_index()."""
+
+    weak_king = index % 64
+    strong_king = index // 64 % 64
+    pawn_index = index // 4096 % KPK_PAWN_SQUARES
+    pawn_sq = (pawn_index // 4 + 1) * 8 + pawn_index % 4
+    return index // (4096 * KPK_PAWN_SQUARES), pawn_sq, strong_king, weak_king
+
+
+def _promotion_wins(board: Board, from_num: int, to_num: int) -> bool:
+    """
+    Internal function. Test whether promoting the pawn (to a queen or, to
+    avoid stalemate, a rook) wins: the new piece must not be lost at once
+    and Black must not be stalemated. King and queen or rook against king
+    is won in every other position.
+    """
+    for promote_to in ('q', 'r'):
+        board.make_move(from_num, to_num, promote_to, True)
+        replies = board._all_legal_moves
+        if not replies:
+            wins = board.is_in_check()
+        else:
+            wins = all(reply_to != to_num for _, reply_to in replies)
+        board.unmake_move()
+        if wins:
+            return True
+    return False
+
+
+def generate_kpk(verbose: bool = False) -> bytes:
+    """
+    Generate the KPK bitbase by retrograde analysis. The legal moves of
+    every position are generated by Board, then the results are propagated
+    backwards: a position with White to move is won if any move leads to
+    a won position, one with Black to move if all moves do. Positions still
+    undecided when nothing changes any more are draws. Returns the packed
+    bits (see KPK_POSITIONS).
+    """
+    start_time = time()
+    results = bytearray(KPK_POSITIONS + 1)
+    # Successor used for moves ending the game in a draw
+    results[KPK_POSITIONS] = _DRAW
+    successors: List[List[int]] = [None] * KPK_POSITIONS
+    board = Board()
+    chessboard = board._chessboard
+
+    for index in range(KPK_POSITIONS):
+        weak_to_move, pawn_sq, strong_king, weak_king = _decode_kpk_index(index)
+        if (len({pawn_sq, strong_king, weak_king}) < 3 or
+                abs(strong_king // 8 - weak_king // 8) <= 1 and
+                abs(strong_king % 8 - weak_king % 8) <= 1):
+            results[index] = _INVALID
+            continue
+        chessboard[:] = bytes(64)
+        chessboard[pawn_sq] = WHITE | PAWN
+        chessboard[strong_king] = WHITE | KING
+        chessboard[weak_king] = BLACK | KING
+        board._to_move = BLACK if weak_to_move else WHITE
+        board._castling = 0
+        board._ep_square = -1
+        board._rebuild_piece_lists()
+        board._legal_moves_dirty = True
+
+        # The side not to move must not be in check
+        board._to_move ^= COLOUR_MASK
+        in_check = board.is_in_check()
+        board._to_move ^= COLOUR_MASK
+        if in_check:
+            results[index] = _INVALID
+            continue
+
+        moves = board.get_all_legal_moves()
+        if not moves:
+            results[index] = _WIN if board.is_in_check() else _DRAW
+            continue
+
+        position_successors = []
+        for from_num, to_num in moves:
+            if weak_to_move:
+                if to_num == pawn_sq:
+                    # Pawn captured, bare kings
+                    results[index] = _DRAW
+                    break
+                position_successors.append(kpk_index(0, pawn_sq, strong_king, to_num))
+            elif chessboard[from_num] == WHITE | PAWN:
+                if to_num // 8 == 7:
+                    if _promotion_wins(board, from_num, to_num):
+                        results[index] = _WIN
+                        break
+                    position_successors.append(KPK_POSITIONS)
+                else:
+                    position_successors.append(kpk_index(1, to_num, strong_king, weak_king))
+            else:
+                position_successors.append(kpk_index(1, pawn_sq, to_num, weak_king))
+        if results[index] == _UNKNOWN:
+            successors[index] = position_successors
+
+    if verbose:
+        print(f'Positions set up: {round(time() - start_time, 2)} s', file=sys.stderr)
+
+    # Propagate the results until no position changes
+    undecided = [index for index in range(KPK_POSITIONS) if results[index] == _UNKNOWN]
+    passes = 0
+    while undecided:
+        passes += 1
+        still_undecided = []
+        for index in undecided:
+            outcomes = [results[successor] for successor in successors[index]]
+            if index < KPK_POSITIONS // 2:
+                # White to move: win if any move wins, draw if none can
+                if _WIN in outcomes:
+                    results[index] = _WIN
+                elif _UNKNOWN not in outcomes:
+                    results[index] = _DRAW
+            else:
+                # Black to move: draw if any move draws, win if all lose
+                if _DRAW in outcomes:
+                    results[index] = _DRAW
+                elif _UNKNOWN not in outcomes:
+                    results[index] = _WIN
+            if results[index] == _UNKNOWN:
+                still_undecided.append(index)
+        if len(still_undecided) == len(undecided):
+            break
+        undecided = still_undecided
+
+    bits = bytearray(KPK_POSITIONS // 8)
+    for index in range(KPK_POSITIONS):
+        if results[index] == _WIN:
+            bits[index >> 3] |= 1 << (index & 7)
+    if verbose:
+        wins = sum(bin(byte).count('1') for byte in bits)
+        valid = sum(1 for result in results[:KPK_POSITIONS] if result != _INVALID)
+        print(f'Positions: {valid} \tWon: {wins} \tPasses: {passes} \t'
+              f'Time: {round(time() - start_time, 2)} s', file=sys.stderr)
+    return bytes(bits)
+
+
+def load_kpk(path: str = KPK_PATH) -> None:
+    """Memory-map the KPK bitbase file (see generate_kpk()) for probing."""
+
+    global _kpk_data
+    with open(path, 'rb') as kpk_file:
+        data = mmap.mmap(kpk_file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(data) != KPK_POSITIONS // 8:
+        data.close()
+        raise ValueError(f'Invalid KPK bitbase size: {path}')
+    _kpk_data = data
+
+
+def probe_kpk(board: Board) -> Optional[int]:
+    """
+    Return the result of a king and pawn against king position from the
+    point of view of the side to move: 1 if won, -1 if lost, 0 if drawn,
+    or None if the position has other pieces. See Board.probe_bitbase().
+    """
+    piece_lists = board._piece_lists
+    if len(piece_lists[0]) + len(piece_lists[1]) != 3:
+        return None
+    pieces = piece_lists[0] + piece_lists[1]
+    chessboard = board._chessboard
+    pawn_sq = -1
+    for sq_num in pieces:
+        piece_type = chessboard[sq_num] & TYPE_MASK
+        if piece_type == PAWN:
+            pawn_sq = sq_num
+        elif piece_type != KING:
+            return None
+    # No pawn, or one which cannot be there
+    if not 8 <= pawn_sq < 56:
+        return None
+
+    if _kpk_data is None:
+        load_kpk()
+
+    # Normalise to a White pawn on files a-d
+    strong = chessboard[pawn_sq] & COLOUR_MASK
+    strong_king = board._king_squares[strong >> 4]
+    weak_king = board._king_squares[(strong ^ COLOUR_MASK) >> 4]
+    flip = 0 if strong == WHITE else 56
+    if pawn_sq % 8 > 3:
+        flip |= 7
+    weak_to_move = 0 if board._to_move == strong else 1
+    index = kpk_index(weak_to_move, pawn_sq ^ flip, strong_king ^ flip, weak_king ^ flip)
+    if not _kpk_data[index >> 3] >> (index & 7) & 1:
+        return 0
+    return -1 if weak_to_move else 1
+
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point: generate the KPK bitbase file."""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate the KPK endgame bitbase.')
+    parser.add_argument('-o', '--output', default=KPK_PATH,
+                        help='bitbase file to write (default: kpk.bin in the package)')
+    args = parser.parse_args(argv)
+
+    bits = generate_kpk(verbose=True)
+    with open(args.output, 'wb') as kpk_file:
+        kpk_file.write(bits)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
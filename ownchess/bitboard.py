@@ -0,0 +1,664 @@
+from typing import Dict, List, Tuple
+
+
+# Piece indices into BitBoard._bitboards: colour * 6 + piece type
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+WHITE, BLACK = 0, 1
+PIECE_CHARS = 'PNBRQKpnbrqk'
+
+FULL_MASK = (1 << 64) - 1
+RANK_3 = 0xFF << 16
+RANK_6 = 0xFF << 40
+
+# Ray directions as (row, col) steps. The first four move towards higher
+# square numbers (first blocker is the least significant bit), the last four
+# towards lower square numbers (first blocker is the most significant bit).
+RAY_DIRS = ((1, 0), (0, 1), (1, 1), (1, -1),
+            (-1, 0), (0, -1), (-1, -1), (-1, 1))
+
+
+def _build_leaper_table(steps: Tuple[Tuple[int, int], ...]) -> List[int]:
+    """Return a per-square list of target bitmasks for a leaping piece."""
+
+    table = []
+    for sq_num in range(64):
+        row, col = sq_num // 8, sq_num % 8
+        mask = 0
+        for mv_row, mv_col in steps:
+            dest_row, dest_col = row + mv_row, col + mv_col
+            if 0 <= dest_row <= 7 and 0 <= dest_col <= 7:
+                mask |= 1 << (dest_row*8 + dest_col)
+        table.append(mask)
+    return table
+
+
+def _build_ray_tables() -> Tuple[List[List[int]], List[List[int]],
+                                 List[List[int]]]:
+    """
+    Return the ray masks for every direction and square, as well as the
+    'between' (exclusive) and 'line' (edge to edge) masks for every pair
+    of aligned squares.
+    """
+    rays = [[0] * 64 for _ in RAY_DIRS]
+    between = [[0] * 64 for _ in range(64)]
+    line = [[0] * 64 for _ in range(64)]
+
+    for dir_ind, (mv_row, mv_col) in enumerate(RAY_DIRS):
+        for sq_num in range(64):
+            row, col = sq_num // 8 + mv_row, sq_num % 8 + mv_col
+            mask = 0
+            while 0 <= row <= 7 and 0 <= col <= 7:
+                dest_num = row*8 + col
+                between[sq_num][dest_num] = mask
+                mask |= 1 << dest_num
+                row += mv_row
+                col += mv_col
+            rays[dir_ind][sq_num] = mask
+
+    for dir_ind in range(4):
+        for sq_num in range(64):
+            full_line = (rays[dir_ind][sq_num] | rays[dir_ind + 4][sq_num] |
+                         1 << sq_num)
+            ray = rays[dir_ind][sq_num] | rays[dir_ind + 4][sq_num]
+            while ray:
+                dest_num = (ray & -ray).bit_length() - 1
+                line[sq_num][dest_num] = full_line
+                ray &= ray - 1
+
+    return rays, between, line
+
+
+KNIGHT_ATTACKS = _build_leaper_table(((1, 2), (1, -2), (-1, 2), (-1, -2),
+                                      (2, 1), (2, -1), (-2, 1), (-2, -1)))
+KING_ATTACKS = _build_leaper_table(((1, 1), (1, 0), (1, -1), (0, 1),
+                                    (0, -1), (-1, 1), (-1, 0), (-1, -1)))
+PAWN_ATTACKS = (_build_leaper_table(((1, -1), (1, 1))),
+                _build_leaper_table(((-1, -1), (-1, 1))))
+RAYS, BETWEEN, LINE = _build_ray_tables()
+(RAY_N, RAY_E, RAY_NE, RAY_NW, RAY_S, RAY_W, RAY_SW, RAY_SE) = RAYS
+
+# Castling rights bits: K Q k q. Moving from or to a square keeps the rights
+# selected by the mask, which handles king moves, rook moves and captures.
+CASTLE_MASK = [0b1111] * 64
+CASTLE_MASK[4] = 0b1100
+CASTLE_MASK[0] = 0b1101
+CASTLE_MASK[7] = 0b1110
+CASTLE_MASK[60] = 0b0011
+CASTLE_MASK[56] = 0b0111
+CASTLE_MASK[63] = 0b1011
+
+
+def bishop_attacks(sq_num: int, occ: int) -> int:
+    """Return a bitmask of squares attacked diagonally from a square."""
+
+    attacks = 0
+    for rays in (RAY_NE, RAY_NW):
+        ray = rays[sq_num]
+        blockers = ray & occ
+        if blockers:
+            ray ^= rays[(blockers & -blockers).bit_length() - 1]
+        attacks |= ray
+    for rays in (RAY_SW, RAY_SE):
+        ray = rays[sq_num]
+        blockers = ray & occ
+        if blockers:
+            ray ^= rays[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+def rook_attacks(sq_num: int, occ: int) -> int:
+    """Return a bitmask of squares attacked orthogonally from a square."""
+
+    attacks = 0
+    for rays in (RAY_N, RAY_E):
+        ray = rays[sq_num]
+        blockers = ray & occ
+        if blockers:
+            ray ^= rays[(blockers & -blockers).bit_length() - 1]
+        attacks |= ray
+    for rays in (RAY_S, RAY_W):
+        ray = rays[sq_num]
+        blockers = ray & occ
+        if blockers:
+            ray ^= rays[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+class BitBoard:
+    """
+    Class representing an 8x8 chessboard as a set of bitboards. Drop-in
+    alternative to Board for perft and analysis workloads - square numbering,
+    move tuples and FEN handling are identical.
+    """
+
+    # FEN string of initial position
+    FEN_INIT = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+    def __init__(self, fen: str = '') -> None:
+        """
+        Create a BitBoard object and set it up according to given FEN
+        (initial position if FEN not specified).
+        """
+        # One bitboard per piece (see PIECE_CHARS for order), occupancy
+        # per colour and a square -> piece index lookup (-1 if empty)
+        self._bitboards = [0] * 12
+        self._occupancy = [0, 0]
+        self._piece_on = [-1] * 64
+
+        # Create variables to hold board properties
+        self._side = WHITE
+        self._castling = 0
+        self._ep_square = -1
+        self._halfmove_clock = -1
+        self._fullmove_counter = -1
+
+        # Create a move list to keep track of moves made
+        self._move_history = []
+
+        # Create a legal moves list
+        self._all_legal_moves = []
+
+        # Set the position from given FEN
+        self.set_fen(fen)
+
+    def __str__(self) -> str:
+        """Return a string for printing the board (White's perspective)."""
+
+        s = ''
+        for sq_row in range(7, -1, -1):
+            for sq_col in range(8):
+                piece = self._piece_on[sq_row*8 + sq_col]
+                s += (PIECE_CHARS[piece] if piece != -1 else '.') + ' '
+            s += str(sq_row + 1) + '\n'
+        s += 'a b c d e f g h'
+        return s
+
+    def __repr__(self) -> str:
+        """Link to __str__() as some printing functions call __repr__()."""
+
+        return self.__str__()
+
+    def alg_to_num(self, coords_str: str) -> int:
+        """
+        Convert algebraic notation of a square to a corresponding number
+        used by the board.
+        """
+        if len(coords_str) != 2:
+            return -1
+        rank, file_ord = int(coords_str[1]), ord(coords_str[0].lower())
+        return (rank - 1) * 8 + (file_ord - 97)
+
+    def num_to_alg(self, sq_num: int) -> str:
+        """Convert square number used by the board to algebraic notation."""
+
+        if sq_num == -1:
+            return '-'
+        return f'{chr(sq_num % 8 + 97)}{sq_num // 8 + 1}'
+
+    def set_fen(self, fen: str = '') -> None:
+        """
+        Set the board up according to FEN (initial position if FEN
+        not specified). Does not check whether the FEN string is correct.
+        """
+        if fen == '':
+            fen = BitBoard.FEN_INIT
+
+        self._bitboards = [0] * 12
+        self._occupancy = [0, 0]
+        self._piece_on = [-1] * 64
+        self._move_history = []
+
+        fen_data = fen.strip().split(' ')
+        if len(fen_data) < 6:
+            rows, to_move, cn_cs, ep_sq = fen_data
+            hm_cl, fm_ct = 0, 1
+        else:
+            rows, to_move, cn_cs, ep_sq, hm_cl, fm_ct = fen_data
+
+        self._side = WHITE if to_move == 'w' else BLACK
+        self._castling = 0
+        for index, letter in enumerate(('K', 'Q', 'k', 'q')):
+            if letter in cn_cs:
+                self._castling |= 1 << index
+        self._ep_square = self.alg_to_num(ep_sq)
+        self._halfmove_clock = int(hm_cl)
+        self._fullmove_counter = int(fm_ct)
+
+        for f_row, row_str in enumerate(rows.split('/')):
+            col = 0
+            for char in row_str:
+                if char.isdigit():
+                    col += int(char)
+                else:
+                    piece = PIECE_CHARS.index(char)
+                    sq_num = (7-f_row)*8 + col
+                    self._bitboards[piece] |= 1 << sq_num
+                    self._occupancy[piece // 6] |= 1 << sq_num
+                    self._piece_on[sq_num] = piece
+                    col += 1
+
+        # Update list of legal moves
+        self._all_legal_moves = self.get_all_legal_moves()
+
+    def get_fen(self) -> str:
+        """Return a FEN string of the current position."""
+
+        pcs = ''
+        for sq_row in range(7, -1, -1):
+            num = 0
+            for sq_col in range(8):
+                piece = self._piece_on[sq_row*8 + sq_col]
+                if piece == -1:
+                    num += 1
+                else:
+                    if num != 0:
+                        pcs += str(num)
+                    pcs += PIECE_CHARS[piece]
+                    num = 0
+            if num != 0:
+                pcs += str(num)
+            if sq_row != 0:
+                pcs += '/'
+
+        cn_cs = ''
+        for index, letter in enumerate(('K', 'Q', 'k', 'q')):
+            if self._castling & 1 << index:
+                cn_cs += letter
+        cn_cs = '-' if cn_cs == '' else cn_cs
+
+        to_mv = 'w' if self._side == WHITE else 'b'
+        return (f'{pcs} {to_mv} {cn_cs} {self.num_to_alg(self._ep_square)} '
+                f'{self._halfmove_clock} {self._fullmove_counter}')
+
+    def is_square_attacked(self, sq_num: int, by_colour: int, occ: int) -> bool:
+        """
+        Test whether a square is attacked by pieces of given colour,
+        with sliding attacks computed against the given occupancy.
+        """
+        bbs = self._bitboards
+        base = by_colour * 6
+        if PAWN_ATTACKS[by_colour ^ 1][sq_num] & bbs[base + PAWN]:
+            return True
+        if KNIGHT_ATTACKS[sq_num] & bbs[base + KNIGHT]:
+            return True
+        if KING_ATTACKS[sq_num] & bbs[base + KING]:
+            return True
+        queens = bbs[base + QUEEN]
+        diag = bbs[base + BISHOP] | queens
+        if diag and bishop_attacks(sq_num, occ) & diag:
+            return True
+        orth = bbs[base + ROOK] | queens
+        if orth and rook_attacks(sq_num, occ) & orth:
+            return True
+        return False
+
+    def is_in_check(self) -> bool:
+        """Test whether the player to move is in check."""
+
+        us = self._side
+        ksq = self._bitboards[us*6 + KING].bit_length() - 1
+        return self.is_square_attacked(
+            ksq, us ^ 1, self._occupancy[0] | self._occupancy[1])
+
+    def get_all_legal_moves(self) -> List[Tuple[int, int]]:
+        """
+        Return a list of tuples representing all legal moves in position.
+        Checkers and absolute pins are computed once, so no move has to be
+        made on the board to be verified (save for en passant).
+        """
+        bbs = self._bitboards
+        us, them = self._side, self._side ^ 1
+        own, base = us * 6, them * 6
+        occ_us, occ_them = self._occupancy[us], self._occupancy[them]
+        occ = occ_us | occ_them
+        not_us = ~occ_us & FULL_MASK
+        moves = []
+        append = moves.append
+
+        ksq = bbs[own + KING].bit_length() - 1
+        their_diag = bbs[base + BISHOP] | bbs[base + QUEEN]
+        their_orth = bbs[base + ROOK] | bbs[base + QUEEN]
+        checkers = ((PAWN_ATTACKS[us][ksq] & bbs[base + PAWN]) |
+                    (KNIGHT_ATTACKS[ksq] & bbs[base + KNIGHT]) |
+                    (bishop_attacks(ksq, occ) & their_diag) |
+                    (rook_attacks(ksq, occ) & their_orth))
+
+        # King moves - the king itself must not block attacks on its targets
+        occ_no_king = occ ^ (1 << ksq)
+        targets = KING_ATTACKS[ksq] & not_us
+        while targets:
+            to_bit = targets & -targets
+            to_num = to_bit.bit_length() - 1
+            if not self.is_square_attacked(to_num, them, occ_no_king):
+                append((ksq, to_num))
+            targets ^= to_bit
+
+        # Double check - only the king can move
+        if checkers & (checkers - 1):
+            return moves
+
+        if checkers:
+            check_mask = BETWEEN[ksq][checkers.bit_length() - 1] | checkers
+        else:
+            check_mask = FULL_MASK
+            # Castling
+            rights = self._castling >> (2 * us) & 0b11
+            if rights:
+                shift = 56 * us
+                if (rights & 1 and not occ & (0x60 << shift) and
+                    not self.is_square_attacked(5 + shift, them, occ) and
+                    not self.is_square_attacked(6 + shift, them, occ)):
+                    append((ksq, ksq + 2))
+                if (rights & 2 and not occ & (0x0E << shift) and
+                    not self.is_square_attacked(3 + shift, them, occ) and
+                    not self.is_square_attacked(2 + shift, them, occ)):
+                    append((ksq, ksq - 2))
+
+        # Absolute pins - x-ray from the king through our own pieces
+        pinned = 0
+        pin_lines = {}
+        snipers = ((bishop_attacks(ksq, occ_them) & their_diag) |
+                   (rook_attacks(ksq, occ_them) & their_orth))
+        while snipers:
+            sniper_bit = snipers & -snipers
+            sniper_num = sniper_bit.bit_length() - 1
+            blockers = BETWEEN[ksq][sniper_num] & occ_us
+            if blockers and not blockers & (blockers - 1):
+                pinned |= blockers
+                pin_lines[blockers.bit_length() - 1] = LINE[ksq][sniper_num]
+            snipers ^= sniper_bit
+
+        targets_mask = not_us & check_mask
+
+        # Knights (pinned knights can never move)
+        pieces = bbs[own + KNIGHT] & ~pinned
+        while pieces:
+            from_bit = pieces & -pieces
+            from_num = from_bit.bit_length() - 1
+            targets = KNIGHT_ATTACKS[from_num] & targets_mask
+            while targets:
+                to_bit = targets & -targets
+                append((from_num, to_bit.bit_length() - 1))
+                targets ^= to_bit
+            pieces ^= from_bit
+
+        # Ray pieces - queens are generated by both passes
+        for pieces, attacks in (
+                (bbs[own + BISHOP] | bbs[own + QUEEN], bishop_attacks),
+                (bbs[own + ROOK] | bbs[own + QUEEN], rook_attacks)):
+            while pieces:
+                from_bit = pieces & -pieces
+                from_num = from_bit.bit_length() - 1
+                targets = attacks(from_num, occ) & targets_mask
+                if from_bit & pinned:
+                    targets &= pin_lines[from_num]
+                while targets:
+                    to_bit = targets & -targets
+                    append((from_num, to_bit.bit_length() - 1))
+                    targets ^= to_bit
+                pieces ^= from_bit
+
+        # Pawns
+        pawns = bbs[own + PAWN]
+        empty = ~occ & FULL_MASK
+        if us == WHITE:
+            single = (pawns << 8) & empty
+            double = ((single & RANK_3) << 8) & empty
+            push = 8
+        else:
+            single = (pawns >> 8) & empty
+            double = ((single & RANK_6) >> 8) & empty
+            push = -8
+        for targets, step in ((single & check_mask, push),
+                              (double & check_mask, 2 * push)):
+            while targets:
+                to_bit = targets & -targets
+                to_num = to_bit.bit_length() - 1
+                from_num = to_num - step
+                if not (1 << from_num & pinned and
+                        not to_bit & pin_lines[from_num]):
+                    append((from_num, to_num))
+                targets ^= to_bit
+
+        capture_mask = occ_them & check_mask
+        pieces = pawns
+        while pieces:
+            from_bit = pieces & -pieces
+            from_num = from_bit.bit_length() - 1
+            targets = PAWN_ATTACKS[us][from_num] & capture_mask
+            if from_bit & pinned:
+                targets &= pin_lines[from_num]
+            while targets:
+                to_bit = targets & -targets
+                append((from_num, to_bit.bit_length() - 1))
+                targets ^= to_bit
+            pieces ^= from_bit
+
+        # En passant - verified by removing both pawns from the occupancy
+        ep_sq = self._ep_square
+        if ep_sq != -1:
+            cap_bit = 1 << (ep_sq - push)
+            pieces = PAWN_ATTACKS[them][ep_sq] & pawns
+            while pieces:
+                from_bit = pieces & -pieces
+                occ_after = (occ ^ from_bit ^ cap_bit) | 1 << ep_sq
+                if not ((bishop_attacks(ksq, occ_after) & their_diag) |
+                        (rook_attacks(ksq, occ_after) & their_orth) |
+                        (KNIGHT_ATTACKS[ksq] & bbs[base + KNIGHT]) |
+                        (PAWN_ATTACKS[us][ksq] & bbs[base + PAWN] &
+                         ~cap_bit)):
+                    append((from_bit.bit_length() - 1, ep_sq))
+                pieces ^= from_bit
+
+        return moves
+
+    def make_move(self, from_num: int, to_num: int,
+                  promote_to: str = 'q', perft_mode: bool = False) -> None:
+        """
+        Make a permanent move. Increments the halfmove clock as well as
+        the fullmove counter, changes the en passant target square,
+        removes castling rights.
+        """
+        if not perft_mode:
+            if (from_num, to_num) not in self._all_legal_moves:
+                print(f'DEBUG: Illegal move: {self.num_to_alg(from_num)} -> '
+                      f'{self.num_to_alg(to_num)}')
+                return None
+
+        bbs = self._bitboards
+        occupancy = self._occupancy
+        piece_on = self._piece_on
+        us = self._side
+        them = us ^ 1
+
+        piece = piece_on[from_num]
+        captured = piece_on[to_num]
+        cap_num = to_num
+        from_bit, to_bit = 1 << from_num, 1 << to_num
+
+        # En passant capture
+        if piece % 6 == PAWN and to_num == self._ep_square:
+            cap_num = to_num - 8 if us == WHITE else to_num + 8
+            captured = piece_on[cap_num]
+
+        # Store board properties before making the move
+        self._move_history.append((from_num, to_num, piece, captured, cap_num,
+                                   self._castling, self._ep_square,
+                                   self._halfmove_clock, self._all_legal_moves))
+
+        if captured != -1:
+            cap_bit = 1 << cap_num
+            bbs[captured] ^= cap_bit
+            occupancy[them] ^= cap_bit
+            piece_on[cap_num] = -1
+
+        # Move the piece, promoting if it is a pawn reaching the last rank
+        bbs[piece] ^= from_bit
+        occupancy[us] ^= from_bit | to_bit
+        piece_on[from_num] = -1
+        if piece % 6 == PAWN and to_num // 8 in (0, 7):
+            promoted = us * 6 + 'pnbrqk'.index(promote_to)
+            bbs[promoted] ^= to_bit
+            piece_on[to_num] = promoted
+        else:
+            bbs[piece] ^= to_bit
+            piece_on[to_num] = piece
+
+        # Castling - move the rook as well
+        if piece % 6 == KING and abs(to_num - from_num) == 2:
+            if to_num > from_num:
+                rook_from, rook_to = from_num + 3, from_num + 1
+            else:
+                rook_from, rook_to = from_num - 4, from_num - 1
+            rook_bits = 1 << rook_from | 1 << rook_to
+            bbs[us*6 + ROOK] ^= rook_bits
+            occupancy[us] ^= rook_bits
+            piece_on[rook_to] = piece_on[rook_from]
+            piece_on[rook_from] = -1
+
+        self._castling &= CASTLE_MASK[from_num] & CASTLE_MASK[to_num]
+
+        if piece % 6 == PAWN or captured != -1:
+            self._halfmove_clock = 0
+        else:
+            self._halfmove_clock += 1
+        if us == BLACK:
+            self._fullmove_counter += 1
+
+        if piece % 6 == PAWN and abs(to_num - from_num) == 16:
+            self._ep_square = (from_num + to_num) // 2
+        else:
+            self._ep_square = -1
+
+        self._side = them
+
+        # Update the list of legal moves
+        self._all_legal_moves = self.get_all_legal_moves()
+
+    def unmake_move(self) -> None:
+        """Unmake the last move made using the make_move() function."""
+
+        if len(self._move_history) == 0:
+            print('DEBUG: Nothing to unmake')
+            return None
+
+        (from_num, to_num, piece, captured, cap_num, self._castling,
+         self._ep_square, self._halfmove_clock,
+         self._all_legal_moves) = self._move_history.pop()
+
+        bbs = self._bitboards
+        occupancy = self._occupancy
+        piece_on = self._piece_on
+        them = self._side
+        us = them ^ 1
+        from_bit, to_bit = 1 << from_num, 1 << to_num
+
+        if us == BLACK:
+            self._fullmove_counter -= 1
+        self._side = us
+
+        # Castling - move the rook back
+        if piece % 6 == KING and abs(to_num - from_num) == 2:
+            if to_num > from_num:
+                rook_from, rook_to = from_num + 3, from_num + 1
+            else:
+                rook_from, rook_to = from_num - 4, from_num - 1
+            rook_bits = 1 << rook_from | 1 << rook_to
+            bbs[us*6 + ROOK] ^= rook_bits
+            occupancy[us] ^= rook_bits
+            piece_on[rook_from] = piece_on[rook_to]
+            piece_on[rook_to] = -1
+
+        # Move the piece back (undoing a possible promotion)
+        bbs[piece_on[to_num]] ^= to_bit
+        bbs[piece] ^= from_bit
+        occupancy[us] ^= from_bit | to_bit
+        piece_on[to_num] = -1
+        piece_on[from_num] = piece
+
+        if captured != -1:
+            cap_bit = 1 << cap_num
+            bbs[captured] ^= cap_bit
+            occupancy[them] ^= cap_bit
+            piece_on[cap_num] = captured
+
+    def detect_game_end(self, verbose: bool = False) -> int:
+        """
+        Detect and handle game ending states - stalemates and checkmates.
+        Returns 1 if checkmate, 2 if stalemate, 0 otherwise.
+        """
+        if len(self._all_legal_moves) == 0:
+            if self.is_in_check():
+                if verbose:
+                    colour = 'White' if self._side == BLACK else 'Black'
+                    print(f'Checkmate. {colour} wins')
+                return 1
+            else:
+                if verbose:
+                    print('Stalemate')
+                return 2
+        return 0
+
+    def perft(self, depth: int) -> int:
+        """
+        Return number of leaf nodes (possible positions after all legal moves)
+        at set depth from current position.
+        """
+        if depth < 0:
+            raise ValueError('Negative depth')
+        if depth == 0:
+            return 1
+
+        # Pawns able to promote this ply
+        pawns = self._bitboards[self._side*6 + PAWN]
+        promoting = pawns & (0xFF << 48 if self._side == WHITE else 0xFF << 8)
+
+        if depth == 1:
+            counter = len(self._all_legal_moves)
+            if promoting:
+                for move_from, move_to in self._all_legal_moves:
+                    if promoting >> move_from & 1:
+                        counter += 3
+            return counter
+
+        leaf_nodes = 0
+        for move_from, move_to in self._all_legal_moves:
+            # Handling promotions
+            if promoting >> move_from & 1:
+                for promote_to in ('q', 'r', 'b', 'n'):
+                    self.make_move(move_from, move_to, promote_to, True)
+                    leaf_nodes += self.perft(depth - 1)
+                    self.unmake_move()
+            else:
+                self.make_move(move_from, move_to, 'q', True)
+                leaf_nodes += self.perft(depth - 1)
+                self.unmake_move()
+        return leaf_nodes
+
+    def divide(self, depth: int) -> Dict[str, int]:
+        """Perft variation listing the node counts for each possible move."""
+
+        if depth < 1:
+            return {}
+
+        pawns = self._bitboards[self._side*6 + PAWN]
+        promoting = pawns & (0xFF << 48 if self._side == WHITE else 0xFF << 8)
+
+        leaf_nodes_dict = {}
+        for move_from, move_to in self._all_legal_moves:
+            move_str = f'{self.num_to_alg(move_from)}{self.num_to_alg(move_to)}'
+            # Handling promotions
+            if promoting >> move_from & 1:
+                for promote_to in ('q', 'r', 'b', 'n'):
+                    self.make_move(move_from, move_to, promote_to, True)
+                    leaf_nodes_dict[move_str + promote_to.upper()] = (
+                        self.perft(depth - 1))
+                    self.unmake_move()
+            else:
+                self.make_move(move_from, move_to, 'q', True)
+                leaf_nodes_dict[move_str] = self.perft(depth - 1)
+                self.unmake_move()
+
+        return leaf_nodes_dict
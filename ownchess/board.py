@@ -0,0 +1,2058 @@
+from typing import Dict, Iterator, List, Optional, Tuple, Set
+from array import array
+from struct import Struct
+import os
+
+
+def _build_target_table(steps: List[Tuple[int, int]]) -> List[List[int]]:
+    """
+    Return a list of target squares reachable from every square on the 
+    board with a single step of a leaping piece (king, knight, pawn capture).
+    """
+    table = []
+    for sq_num in range(64):
+        row, col = sq_num // 8, sq_num % 8
+        targets = []
+        for mv_row, mv_col in steps:
+            dest_row, dest_col = row + mv_row, col + mv_col
+            if 0 <= dest_row <= 7 and 0 <= dest_col <= 7:
+                targets.append(dest_row*8 + dest_col)
+        table.append(targets)
+    return table
+
+
+def _build_ray_table(directions: List[Tuple[int, int]]) -> List[List[List[int]]]:
+    """
+    Return a list of rays (lists of squares ordered outwards, edge excluded)
+    in the given directions for every square on the board. Empty rays 
+    are skipped.
+    """
+    table = []
+    for sq_num in range(64):
+        rays = []
+        for mv_row, mv_col in directions:
+            dest_row, dest_col = sq_num // 8 + mv_row, sq_num % 8 + mv_col
+            ray = []
+            while 0 <= dest_row <= 7 and 0 <= dest_col <= 7:
+                ray.append(dest_row*8 + dest_col)
+                dest_row += mv_row
+                dest_col += mv_col
+            if ray:
+                rays.append(ray)
+        table.append(rays)
+    return table
+
+
+# Precomputed move tables, built once at import
+KING_TARGETS = _build_target_table([(1, 1), (1, 0), (1, -1), (0, 1),
+                                    (0, -1), (-1, 1), (-1, 0), (-1, -1)])
+KNIGHT_TARGETS = _build_target_table([(1, 2), (1, -2), (-1, 2), (-1, -2),
+                                      (2, 1), (2, -1), (-2, 1), (-2, -1)])
+# Squares attacked by a pawn of given colour (indexed by colour >> 4) 
+# standing on a square
+PAWN_CAPTURES = (_build_target_table([(1, -1), (1, 1)]),
+                 _build_target_table([(-1, -1), (-1, 1)]))
+BISHOP_RAYS = _build_ray_table([(-1, -1), (-1, 1), (1, -1), (1, 1)])
+ROOK_RAYS = _build_ray_table([(-1, 0), (0, -1), (1, 0), (0, 1)])
+QUEEN_RAYS = [BISHOP_RAYS[sq_num] + ROOK_RAYS[sq_num] for sq_num in range(64)]
+
+# Square names indexed by square number, and the reverse mapping
+SQUARE_NAMES = tuple(f'{"abcdefgh"[sq_num % 8]}{sq_num // 8 + 1}' for sq_num in range(64))
+SQUARE_NUMBERS = {name: sq_num for sq_num, name in enumerate(SQUARE_NAMES)}
+
+# Piece codes stored in the board bytearray: piece type | colour
+EMPTY = 0
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = 1, 2, 3, 4, 5, 6
+WHITE = 8
+BLACK = 16
+TYPE_MASK = 7
+COLOUR_MASK = WHITE | BLACK # code ^ COLOUR_MASK flips the colour
+# FEN characters indexed by piece code, and the reverse mapping
+PIECE_CHARS = ' ' * 9 + 'PNBRQK' + ' ' * 2 + 'pnbrqk'
+PIECE_CODES = {char: code for code, char in enumerate(PIECE_CHARS) if char != ' '}
+PROMOTION_TYPES = {'n': KNIGHT, 'b': BISHOP, 'r': ROOK, 'q': QUEEN}
+
+# Castling rights bitmask: K Q k q, kingside and queenside bits indexed 
+# by colour >> 4
+CASTLE_KINGSIDE = (1, 4)
+CASTLE_QUEENSIDE = (2, 8)
+# Rights kept after a move from or to a square (king and rook start squares)
+CASTLING_MASK = [15] * 64
+for _sq_num, _lost in ((4, 3), (0, 2), (7, 1), (60, 12), (56, 8), (63, 4)):
+    CASTLING_MASK[_sq_num] = 15 & ~_lost
+
+# Zobrist hashing keys (fixed seed, so that keys are stable between runs), 
+# indexed by piece code; the empty square keys are zero
+def _splitmix64(seed: int) -> Iterator[int]:
+    """Generate 64-bit pseudorandom numbers (SplitMix64) from a seed."""
+
+    mask = (1 << 64) - 1
+    state = seed
+    while True:
+        state = (state + 0x9E3779B97F4A7C15) & mask
+        value = state
+        value = (value ^ value >> 30) * 0xBF58476D1CE4E5B9 & mask
+        value = (value ^ value >> 27) * 0x94D049BB133111EB & mask
+        yield value ^ value >> 31
+
+
+_zobrist_rng = _splitmix64(0x0C4E55)
+ZOBRIST_PIECES = [[0] * 64 for _ in range(BLACK | KING + 1)]
+for _colour in (WHITE, BLACK):
+    for _piece in range(PAWN, KING + 1):
+        ZOBRIST_PIECES[_colour | _piece] = [next(_zobrist_rng) for _ in range(64)]
+ZOBRIST_CASTLING = [next(_zobrist_rng) for _ in range(4)] # K Q k q
+ZOBRIST_EP_FILE = [next(_zobrist_rng) for _ in range(8)]
+ZOBRIST_BLACK_TO_MOVE = next(_zobrist_rng)
+# Combined keys for every castling rights bitmask
+ZOBRIST_CASTLING_RIGHTS = [0] * 16
+for _rights in range(16):
+    for _index in range(4):
+        if _rights >> _index & 1:
+            ZOBRIST_CASTLING_RIGHTS[_rights] ^= ZOBRIST_CASTLING[_index]
+
+# Piece values and piece-square tables (White's perspective, a8 first, 
+# as printed) for the middlegame and the endgame, indexed by piece type
+MATERIAL_MG = (0, 100, 320, 330, 500, 900, 0)
+MATERIAL_EG = (0, 120, 300, 320, 520, 940, 0)
+_PST_PAWN_MG = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+     50,  50,  50,  50,  50,  50,  50,  50,
+     10,  10,  20,  30,  30,  20,  10,  10,
+      5,   5,  10,  25,  25,  10,   5,   5,
+      0,   0,   0,  20,  20,   0,   0,   0,
+      5,  -5, -10,   0,   0, -10,  -5,   5,
+      5,  10,  10, -20, -20,  10,  10,   5,
+      0,   0,   0,   0,   0,   0,   0,   0)
+_PST_PAWN_EG = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+     90,  90,  90,  90,  90,  90,  90,  90,
+     60,  60,  60,  60,  60,  60,  60,  60,
+     35,  35,  35,  35,  35,  35,  35,  35,
+     20,  20,  20,  20,  20,  20,  20,  20,
+     10,  10,  10,  10,  10,  10,  10,  10,
+      0,   0,   0,   0,   0,   0,   0,   0,
+      0,   0,   0,   0,   0,   0,   0,   0)
+_PST_KNIGHT = (
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20,   0,   0,   0,   0, -20, -40,
+    -30,   0,  10,  15,  15,  10,   0, -30,
+    -30,   5,  15,  20,  20,  15,   5, -30,
+    -30,   0,  15,  20,  20,  15,   0, -30,
+    -30,   5,  10,  15,  15,  10,   5, -30,
+    -40, -20,   0,   5,   5,   0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50)
+_PST_BISHOP = (
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,  10,  10,   5,   0, -10,
+    -10,   5,   5,  10,  10,   5,   5, -10,
+    -10,   0,  10,  10,  10,  10,   0, -10,
+    -10,  10,  10,  10,  10,  10,  10, -10,
+    -10,   5,   0,   0,   0,   0,   5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20)
+_PST_ROOK = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+      5,  10,  10,  10,  10,  10,  10,   5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+      0,   0,   0,   5,   5,   0,   0,   0)
+_PST_QUEEN = (
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,   5,   5,   5,   0, -10,
+     -5,   0,   5,   5,   5,   5,   0,  -5,
+      0,   0,   5,   5,   5,   5,   0,  -5,
+    -10,   5,   5,   5,   5,   5,   0, -10,
+    -10,   0,   5,   0,   0,   0,   0, -10,
+    -20, -10, -10,  -5,  -5, -10, -10, -20)
+_PST_KING_MG = (
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+     20,  20,   0,   0,   0,   0,  20,  20,
+     20,  30,  10,   0,   0,  10,  30,  20)
+_PST_KING_EG = (
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10,   0,   0, -10, -20, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -30,   0,   0,   0,   0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50)
+# Game phase weights by piece type, 24 for the initial position
+PHASE_WEIGHTS = (0, 0, 1, 1, 2, 4, 0)
+PHASE_MAX = 24
+
+
+def _build_eval_table(material: Tuple[int, ...], 
+                      tables: Tuple[Tuple[int, ...], ...]) -> List[List[int]]:
+    """
+    Return a list of scores (material and square bonus, positive for White) 
+    of every piece code on every square, zero for empty squares.
+    """
+    table = [[0] * 64 for _ in range(BLACK | KING + 1)]
+    for piece_type in range(PAWN, KING + 1):
+        for sq_num in range(64):
+            # Tables are printed with a8 first, Black's are mirrored
+            score = material[piece_type] + tables[piece_type][sq_num ^ 56]
+            table[WHITE | piece_type][sq_num] = score
+            table[BLACK | piece_type][sq_num ^ 56] = -score
+    return table
+
+
+EVAL_MG = _build_eval_table(MATERIAL_MG, (None, _PST_PAWN_MG, _PST_KNIGHT, _PST_BISHOP, 
+                                          _PST_ROOK, _PST_QUEEN, _PST_KING_MG))
+EVAL_EG = _build_eval_table(MATERIAL_EG, (None, _PST_PAWN_EG, _PST_KNIGHT, _PST_BISHOP, 
+                                          _PST_ROOK, _PST_QUEEN, _PST_KING_EG))
+# Phase weights indexed by piece code
+PHASE_VALUES = [PHASE_WEIGHTS[code & TYPE_MASK] if char != ' ' else 0 
+                for code, char in enumerate(PIECE_CHARS)]
+
+
+
+class PerftTable:
+    """
+    Fixed-size transposition table mapping (hash key, depth) pairs to perft
+    node counts. Every bucket holds two entries: a depth-preferred one, 
+    replaced only by results of equal or greater depth, and an 
+    always-replace one, which takes everything else. The entries are kept
+    in typed arrays, so the table is compact and not scanned by the garbage
+    collector.
+    """
+
+    # Memory cost of a single entry: 64-bit key, 8-bit depth, 64-bit count
+    ENTRY_SIZE = 17
+
+    def __init__(self, hash_mb: int) -> None:
+        """
+        Create an empty table using up to hash_mb megabytes. The number of
+        buckets is rounded down to a power of two, so that indexing is 
+        a bitmask: the table takes between half of hash_mb and hash_mb.
+        """
+        entries = max(2, hash_mb * 2**20 // PerftTable.ENTRY_SIZE)
+        self._mask = (1 << ((entries // 2).bit_length() - 1)) - 1
+        size = 2 * (self._mask + 1)
+        self._keys = array('Q', bytes(8 * size))
+        self._depths = array('b', b'\xff' * size)
+        self._counts = array('Q', bytes(8 * size))
+
+        # Statistics
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def probe(self, key: int, depth: int) -> int:
+        """Return the stored node count for a position, -1 if not found."""
+
+        self.probes += 1
+        index = 2 * (key & self._mask)
+        for slot in (index, index + 1):
+            if self._keys[slot] == key and self._depths[slot] == depth:
+                self.hits += 1
+                return self._counts[slot]
+        return -1
+
+    def store(self, key: int, depth: int, count: int) -> None:
+        """Store the node count for a position using the replacement policy."""
+
+        self.stores += 1
+        slot = 2 * (key & self._mask)
+        # Depth-preferred entry is only taken by deeper (costlier) subtrees
+        if depth < self._depths[slot]:
+            slot += 1
+        if self._depths[slot] != -1:
+            self.overwrites += 1
+        self._keys[slot] = key
+        self._depths[slot] = depth
+        self._counts[slot] = count
+
+    def hit_rate(self) -> float:
+        """Return the fraction of probes which found a stored result."""
+
+        return self.hits / self.probes if self.probes else 0.0
+
+    def stats_str(self) -> str:
+        """Return a string summarising the table usage."""
+
+        return (f'Hash probes: {self.probes} \tHits: {self.hits} '
+                f'({round(100 * self.hit_rate(), 1)}%) \tStores: {self.stores} '
+                f'\tOverwrites: {self.overwrites}')
+
+
+# Distance from the root of the nearest nodes cached by hashed perft
+# (no transposition can reach a position in fewer than 3 plies)
+PERFT_HASH_MIN_PLY = 3
+
+
+# Packed moves: from square | to square << 6 | flags << 12 | promotion << 14,
+# fitting in an unsigned 16-bit integer
+MOVE_QUIET = 0 # also a capture
+MOVE_CASTLING = 1
+MOVE_EN_PASSANT = 2
+MOVE_PROMOTION = 3
+PROMOTION_PIECES = ('n', 'b', 'r', 'q')
+
+
+def encode_move(from_num: int, to_num: int, flags: int = MOVE_QUIET, 
+                promote_to: str = 'n') -> int:
+    """Pack a move into a single integer."""
+
+    promotion = PROMOTION_PIECES.index(promote_to) if flags == MOVE_PROMOTION else 0
+    return from_num | to_num << 6 | flags << 12 | promotion << 14
+
+
+def decode_move(move: int) -> Tuple[int, int, str]:
+    """Unpack a move into make_move() arguments (from, to, promote_to)."""
+
+    if move >> 12 & 3 == MOVE_PROMOTION:
+        return move & 63, move >> 6 & 63, PROMOTION_PIECES[move >> 14]
+    return move & 63, move >> 6 & 63, 'q'
+
+
+class MoveList:
+    """
+    Fixed-capacity list of packed moves backed by an array('H'). Meant to be
+    allocated once and refilled (see Board.generate_moves()) at every node 
+    of the same ply.
+    """
+
+    __slots__ = ('_moves', '_view', '_count')
+
+    # No legal chess position has more than 218 moves
+    CAPACITY = 256
+
+    def __init__(self) -> None:
+        """Create an empty move list with preallocated storage."""
+
+        self._moves = array('H', bytes(2 * MoveList.CAPACITY))
+        self._view = memoryview(self._moves)
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of moves in the list."""
+
+        return self._count
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over the moves in the list without copying them."""
+
+        return iter(self._view[:self._count])
+
+    def __getitem__(self, index: int) -> int:
+        """Return the move at given index."""
+
+        if not -self._count <= index < self._count:
+            raise IndexError('MoveList index out of range')
+        return self._moves[index % self._count]
+
+    def clear(self) -> None:
+        """Empty the list, keeping the storage."""
+
+        self._count = 0
+
+    def append(self, move: int) -> None:
+        """Add a packed move at the end of the list."""
+
+        self._moves[self._count] = move
+        self._count += 1
+
+
+class UndoRecord:
+    """
+    Fixed-layout record of the board state needed to unmake a move. Records
+    are kept in a pool by the Board and reused between moves at the same ply.
+    """
+
+    __slots__ = ('from_num', 'to_num', 'from_piece', 'to_piece', 'captured_index',
+                 'move_type', 'castling', 'ep_square', 'halfmove_clock',
+                 'fullmove_counter', 'zobrist_key')
+
+    def __init__(self) -> None:
+        """Create an empty record."""
+
+        self.from_num = -1
+        self.to_num = -1
+        self.from_piece = EMPTY
+        self.to_piece = EMPTY
+        self.captured_index = -1
+        self.move_type = MOVE_QUIET
+        self.castling = 0
+        self.ep_square = -1
+        self.halfmove_clock = -1
+        self.fullmove_counter = -1
+        self.zobrist_key = 0
+
+    def __repr__(self) -> str:
+        """Return a string listing the recorded values."""
+
+        return f'UndoRecord({", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)})'
+
+
+class BoardState:
+    """
+    Copy of the whole position saved by Board.push_state(): the board bytes,
+    piece lists, square -> list index map and every scalar make_move() 
+    changes. States are kept in a stack by the Board, one per ply, and reused.
+
+    Copying the lists and the 64-entry index map on every move costs about
+    as much as the incremental undo it replaces, so in CPython copy-make 
+    perft is no faster than make/unmake, and usually a few percent slower.
+    """
+
+    __slots__ = ('chessboard', 'piece_lists', 'piece_index', 'king_squares',
+                 'to_move', 'castling', 'ep_square', 'halfmove_clock',
+                 'fullmove_counter', 'zobrist_key', 'eval_mg', 'eval_eg', 'phase',
+                 'history_length', 'key_history_length')
+
+    def __init__(self) -> None:
+        """Create an empty state."""
+
+        self.chessboard = bytearray(64)
+        self.piece_lists = [[], []]
+        self.piece_index = [-1] * 64
+        self.king_squares = [-1, -1]
+        self.to_move = WHITE
+        self.castling = 0
+        self.ep_square = -1
+        self.halfmove_clock = -1
+        self.fullmove_counter = -1
+        self.zobrist_key = 0
+        self.eval_mg = 0
+        self.eval_eg = 0
+        self.phase = 0
+        self.history_length = 0
+        self.key_history_length = 0
+
+
+# Bitbase probing function, imported on first use (bitbase.py imports this
+# module) and kept here, as it is called at every search node
+_probe_kpk = None
+
+
+# Position state stored after the 64 board bytes by Board.to_bytes():
+# side to move, castling rights, en passant square + 1, halfmove clock,
+# fullmove counter
+_STATE_STRUCT = Struct('<BBBHH')
+
+
+def _perft_worker(task: Tuple[str, bytes, int, int, bool]) -> Tuple[str, int]:
+    """
+    Worker process entry point for parallel perft. Takes a tuple of a root
+    move string, a position packed by Board.to_bytes(), depth, hash size 
+    and copy-make flag, returns a tuple of the root move string and the 
+    node count from that position.
+    """
+    move_str, data, depth, hash_mb, copy_make = task
+    return move_str, Board.from_bytes(data).perft(depth, hash_mb, copy_make)
+
+
+class Board:
+    """
+    Class representing an 8x8 chessboard. The squares are stored in a single
+    bytearray of piece codes (piece type | colour, 0 if empty).
+    """
+
+    __slots__ = ('_chessboard', '_to_move', '_castling', '_ep_square',
+                 '_halfmove_clock', '_fullmove_counter', '_piece_lists',
+                 '_piece_index', '_king_squares', '_move_history', '_key_history',
+                 '_undo_pool', '_state_stack', '_state_depth',
+                 '_move_buffers', '_legal_moves_cache', '_legal_moves_dirty',
+                 '_zobrist_key', '_eval_mg', '_eval_eg', '_phase',
+                 '_perft_table')
+
+    # Colour definitions for printing the board to stdout
+    # Escape sequence
+    CLR_ESC = '\x1b[0m'
+    # Light squares
+    CLR_L_B = '\x1b[0;30;46m'
+    CLR_L_W = '\x1b[0;37;46m'
+    # Dark squares
+    CLR_D_B = '\x1b[0;30;44m'
+    CLR_D_W = '\x1b[0;37;44m'
+    # Highlit squares
+    CLR_H_B = '\x1b[0;30;45m'
+    CLR_H_W = '\x1b[0;37;45m'
+
+    # FEN string of initial position
+    FEN_INIT = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+    # Board coordinates:
+    #                   C O L U M N S
+    #           0   1   2   3   4   5   6   7
+    #
+    #    8                                 63       7
+    #    7                                          6
+    #  r 6                                          5  R
+    #  a 5                                          4  O
+    #  n 4                                          3  W
+    #  k 3                                          2  S - multiply by 8
+    #  s 2      8   9  10  11   ...                 1
+    #    1      0   1   2   3   4   5   6   7       0
+    #
+    #           A   B   C   D   E   F   G   H
+    #                    f i l e s
+
+    def __init__(self, fen: str = '') -> None:
+        """
+        Create a Board object with an 8x8 chessboard and set it up according
+        to given FEN (initial position if FEN not specified).
+        """
+        self._allocate()
+
+        # Set the position from given FEN
+        self.set_fen(fen)
+
+    def _allocate(self) -> None:
+        """
+        Internal method. Create the board properties with empty values,
+        shared by __init__(), copy() and from_bytes().
+        """
+        self._chessboard = bytearray(64)
+        # Create variables to hold board properties
+        self._to_move = WHITE
+        self._castling = 0 # bitmask, see CASTLE_KINGSIDE and CASTLE_QUEENSIDE
+        self._ep_square = -1
+        self._halfmove_clock = -1
+        self._fullmove_counter = -1
+
+        # Create piece squares lists (indexed by colour >> 4) and
+        # a square -> list index map
+        self._piece_lists = [[], []]
+        self._piece_index = [-1] * 64
+
+        # Create a helper property containing the king's positions
+        self._king_squares = [-1, -1]
+
+        # Create a move list to keep track of moves made, with a pool of
+        # undo records reused by make_move()
+        self._move_history = []
+        self._undo_pool = []
+
+        # Create a stack of hash keys of the positions before each move made, 
+        # for detecting repetitions
+        self._key_history = []
+
+        # Stack of saved positions for copy-make (see push_state()), 
+        # and the number of states in use
+        self._state_stack = []
+        self._state_depth = 0
+
+        # Move lists reused by perft, one per remaining depth
+        self._move_buffers = []
+
+        # Create a legal moves list, generated lazily on first access
+        self._legal_moves_cache = []
+        self._legal_moves_dirty = True
+
+        # Create the Zobrist hash key of the position
+        self._zobrist_key = 0
+
+        # Create the incremental evaluation terms (see evaluate())
+        self._eval_mg = 0
+        self._eval_eg = 0
+        self._phase = 0
+
+        # Transposition table used by the last hashed perft run
+        self._perft_table = None
+
+    def copy(self) -> 'Board':
+        """
+        Return an independent copy of the position. The move history is not
+        copied, so the moves made before cannot be unmade on the copy.
+        """
+        board = self.__class__.__new__(self.__class__)
+        board._allocate()
+        board._chessboard[:] = self._chessboard
+        board._to_move = self._to_move
+        board._castling = self._castling
+        board._ep_square = self._ep_square
+        board._halfmove_clock = self._halfmove_clock
+        board._fullmove_counter = self._fullmove_counter
+        board._piece_lists = [self._piece_lists[0].copy(), self._piece_lists[1].copy()]
+        board._piece_index = self._piece_index.copy()
+        board._king_squares = self._king_squares.copy()
+        board._zobrist_key = self._zobrist_key
+        board._eval_mg = self._eval_mg
+        board._eval_eg = self._eval_eg
+        board._phase = self._phase
+        # The cached list is replaced, never modified, so it can be shared
+        if not self._legal_moves_dirty:
+            board._legal_moves_cache = self._legal_moves_cache
+            board._legal_moves_dirty = False
+        return board
+
+    def to_bytes(self) -> bytes:
+        """
+        Return the position packed into 71 bytes: the 64 piece codes followed
+        by the side to move, castling rights, en passant square and move
+        counters. The move history is not included.
+        """
+        return bytes(self._chessboard) + _STATE_STRUCT.pack(
+            self._to_move, self._castling, self._ep_square + 1,
+            self._halfmove_clock, self._fullmove_counter)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Board':
+        """Create a Board object from a position packed by to_bytes()."""
+
+        board = cls.__new__(cls)
+        board._allocate()
+        board._chessboard[:] = data[:64]
+        (board._to_move, board._castling, ep_sq, board._halfmove_clock,
+         board._fullmove_counter) = _STATE_STRUCT.unpack_from(data, 64)
+        board._ep_square = ep_sq - 1
+        board._rebuild_piece_lists()
+        board._zobrist_key = board._compute_zobrist_key()
+        board._eval_mg, board._eval_eg, board._phase = board._compute_eval()
+        return board
+
+    def __reduce__(self) -> Tuple:
+        """Pickle the board as its packed position (see to_bytes())."""
+
+        return self.__class__.from_bytes, (self.to_bytes(),)
+
+    def __str__(self, highlit_squares: Set[int] = set()) -> str:
+        """
+        Return a string for printing the board (White's perspective) to stdout.
+        Will highlight certain squares if passed a set of them as an argument.
+        """
+        s = ""
+        sq_light = True  # 56 (top left) is a light square
+        for sq_row in range(7, -1, -1):
+            for sq_col in range(8):
+                piece = self._chessboard[sq_row*8 + sq_col]
+                is_white = piece & WHITE
+                # Colour selection
+                if sq_row*8 + sq_col in highlit_squares:
+                    clr = Board.CLR_H_W if is_white else Board.CLR_H_B
+                elif sq_light:
+                    clr = Board.CLR_L_W if is_white else Board.CLR_L_B
+                else:
+                    clr = Board.CLR_D_W if is_white else Board.CLR_D_B
+
+                s += clr + PIECE_CHARS[piece] + ' ' + Board.CLR_ESC
+                sq_light = not sq_light
+
+            # Rank markings
+            s += str(sq_row + 1) + '\n'
+            sq_light = not sq_light
+
+        # File markings
+        s += ' A B C D E F G H'
+        return s
+
+    def __repr__(self, *args) -> str:
+        """Link to __str__() as some printing functions call __repr__()."""
+
+        return self.__str__(*args)
+
+    def alg_to_num(self, coords_str: str) -> int:
+        """
+        Convert algebraic notation of a square to a corresponding number
+        used by the board (-1 if not a square).
+        """
+        return SQUARE_NUMBERS.get(coords_str.lower(), -1)
+
+    def num_to_alg(self, sq_num: int) -> str:
+        """Convert square number used by the board to algebraic notation."""
+
+        if sq_num == -1:
+            return '-'
+        return SQUARE_NAMES[sq_num]
+
+    def set_fen(self, fen: str = '') -> None:
+        """
+        Set the board up according to FEN (initial position if FEN
+        not specified). Does not check whether the FEN string is correct.
+        """
+        # Set initial position FEN if not specified
+        if fen == '':
+            fen = Board.FEN_INIT
+
+        # Set the starting properties
+        fen_data = fen.strip().split(' ')
+        if len(fen_data) < 6:
+            rows, to_mv, cn_cs, ep_sq = fen_data
+            hm_cl, fm_ct = 0, 1
+        else:
+            rows, to_mv, cn_cs, ep_sq, hm_cl, fm_ct = fen_data
+
+        # Convert the values
+        self._to_move = BLACK if to_mv == 'b' else WHITE
+        self._castling = 0
+        for index, letter in enumerate(('K', 'Q', 'k', 'q')):
+            if letter in cn_cs:
+                self._castling |= 1 << index
+        self._ep_square = self.alg_to_num(ep_sq)
+        self._halfmove_clock = int(hm_cl)
+        self._fullmove_counter = int(fm_ct)
+
+        # Clear the board, then insert the pieces
+        chessboard = self._chessboard
+        chessboard[:] = bytes(64)
+        for f_row, row_str in enumerate(rows.split('/')):
+            col = 0
+            for char in row_str:
+                # char is a number
+                if 49 <= ord(char) <= 56:
+                    col += int(char)
+
+                # char is a piece
+                else:
+                    chessboard[(7-f_row)*8 + col] = PIECE_CODES[char]
+                    col += 1
+
+        # Moves made before cannot be unmade in the new position
+        self._move_history = []
+        self._key_history = []
+        self._state_depth = 0
+
+        # Create the piece lists and find the kings
+        self._rebuild_piece_lists()
+
+        # Compute the hash key and the evaluation from scratch
+        self._zobrist_key = self._compute_zobrist_key()
+        self._eval_mg, self._eval_eg, self._phase = self._compute_eval()
+
+        # Invalidate the list of legal moves
+        self._legal_moves_dirty = True
+
+    def get_fen(self) -> str:
+        """
+        Return a FEN string of the current position.
+        Issue: returns EP square even if EP not possible (should be '-').
+        """
+        pcs = ''
+        for sq_row in range(7, -1, -1):
+            num = 0
+            for sq_col in range(8):
+                piece = self._chessboard[sq_row*8 + sq_col]
+                if piece == EMPTY:
+                    num += 1
+                else:
+                    if num != 0:
+                        pcs += str(num)
+                    pcs += PIECE_CHARS[piece]
+                    num = 0
+            if num != 0:
+                pcs += str(num)
+            if sq_row != 0:
+                pcs += '/'
+
+        cn_cs = ''
+        for index, letter in enumerate(('K', 'Q', 'k', 'q')):
+            if self._castling >> index & 1:
+                cn_cs += letter
+        cn_cs = '-' if cn_cs == '' else cn_cs
+
+        to_mv = 'w' if self._to_move == WHITE else 'b'
+        ep_sq, hm_cl, fm_ct = (self._ep_square, self._halfmove_clock,
+                               self._fullmove_counter)
+
+        return f'{pcs} {to_mv} {cn_cs} {self.num_to_alg(ep_sq)} {hm_cl} {fm_ct}'
+
+    def zobrist_key(self) -> int:
+        """Return the 64-bit Zobrist hash key of the current position."""
+
+        return self._zobrist_key
+
+    def evaluate(self, verify: bool = False) -> int:
+        """
+        Return the static evaluation of the position in centipawns from the
+        point of view of the side to move: material and piece-square scores,
+        interpolated between the middlegame and the endgame by the remaining
+        material. The terms are kept up to date by make_move() and
+        unmake_move(). If verify is set, they are checked against a full
+        recompute (debug purposes only).
+        """
+        if verify:
+            terms = self._compute_eval()
+            if terms != (self._eval_mg, self._eval_eg, self._phase):
+                print(f'DEBUG: Incremental evaluation {(self._eval_mg, self._eval_eg, self._phase)} differs from recomputed {terms}')
+                self._eval_mg, self._eval_eg, self._phase = terms
+
+        phase = min(self._phase, PHASE_MAX)
+        score = self._eval_mg * phase + self._eval_eg * (PHASE_MAX - phase)
+        # Rounded after taking the side to move, so that colour-flipped 
+        # positions get the same score
+        return (score if self._to_move == WHITE else -score) // PHASE_MAX
+
+    def get_pseudolegal_moves(self, sq_num: int) -> List[int]:
+        """
+        Return a list of squares available as targets of pseudolegal moves
+        (moves which might leave the player in check) from selected square.
+        """
+        chessboard = self._chessboard
+        from_piece = chessboard[sq_num]
+        from_colour = from_piece & COLOUR_MASK
+        piece_type = from_piece & TYPE_MASK
+        pseudolegal_moves = []
+
+        if from_colour != self._to_move:
+            return pseudolegal_moves
+
+        # Piece is a pawn
+        elif piece_type == PAWN:
+            start_row, pawn_move = (1, 8) if from_colour == WHITE else (6, -8)
+            # Standard move
+            dest_num = sq_num + pawn_move
+            # Cannot advance pawns onto occupied squares
+            if chessboard[dest_num] == EMPTY:
+                pseudolegal_moves.append(dest_num)
+                # First pawn move
+                dest_num += pawn_move
+                if (sq_num // 8 == start_row and
+                    chessboard[dest_num] == EMPTY):
+                    pseudolegal_moves.append(dest_num)
+
+            # Standard pawn capture, en passant capture
+            their_colour = from_colour ^ COLOUR_MASK
+            for dest_num in PAWN_CAPTURES[from_colour >> 4][sq_num]:
+                if (chessboard[dest_num] & their_colour or
+                    self._ep_square == dest_num):
+                    pseudolegal_moves.append(dest_num)
+
+        # Piece is a king or a knight (not a ray piece)
+        elif piece_type == KING or piece_type == KNIGHT:
+            if piece_type == KING:
+                all_moves = KING_TARGETS[sq_num]
+
+                # Castling
+                tmp_iic_val = None
+                b = chessboard
+                # Castling kingside
+                if self._castling & CASTLE_KINGSIDE[from_colour >> 4]:
+                    if b[sq_num+1] == b[sq_num+2] == EMPTY:
+                        # Test whether king is in check
+                        tmp_iic_val = self.is_in_check()
+                        if not tmp_iic_val:
+                            pseudolegal_moves.append(sq_num + 2)
+                # Castling queenside
+                if self._castling & CASTLE_QUEENSIDE[from_colour >> 4]:
+                    if b[sq_num-1] == b[sq_num-2] == b[sq_num-3] == EMPTY:
+                        if tmp_iic_val is None:
+                            tmp_iic_val = self.is_in_check()
+                        if not tmp_iic_val:
+                            pseudolegal_moves.append(sq_num - 2)
+            else:
+                all_moves = KNIGHT_TARGETS[sq_num]
+
+            for dest_num in all_moves:
+                if not chessboard[dest_num] & from_colour:
+                    pseudolegal_moves.append(dest_num)
+
+        # Piece is a bishop, a rook or a queen (ray piece)
+        else:
+            if piece_type == BISHOP:
+                all_rays = BISHOP_RAYS[sq_num]
+            elif piece_type == ROOK:
+                all_rays = ROOK_RAYS[sq_num]
+            else:
+                all_rays = QUEEN_RAYS[sq_num]
+
+            for ray in all_rays:
+                for dest_num in ray:
+                    to_piece = chessboard[dest_num]
+                    if to_piece == EMPTY:
+                        pseudolegal_moves.append(dest_num)
+                    else:
+                        if not to_piece & from_colour:
+                            pseudolegal_moves.append(dest_num)
+                        break
+
+        return pseudolegal_moves
+
+    def get_pseudolegal_captures(self, sq_num: int) -> List[int]:
+        """
+        Return a list of squares available as targets of pseudolegal captures 
+        (en passant included) and promotions from selected square. Only the 
+        capture targets are looked at, so this is cheaper than filtering 
+        the output of get_pseudolegal_moves().
+        """
+        chessboard = self._chessboard
+        from_piece = chessboard[sq_num]
+        from_colour = from_piece & COLOUR_MASK
+        their_colour = from_colour ^ COLOUR_MASK
+        piece_type = from_piece & TYPE_MASK
+        pseudolegal_captures = []
+
+        if from_colour != self._to_move:
+            return pseudolegal_captures
+
+        # Piece is a pawn
+        elif piece_type == PAWN:
+            # Standard pawn capture, en passant capture
+            for dest_num in PAWN_CAPTURES[from_colour >> 4][sq_num]:
+                if (chessboard[dest_num] & their_colour or
+                    self._ep_square == dest_num):
+                    pseudolegal_captures.append(dest_num)
+            # Promotion without capture
+            pr_row, pawn_move = (6, 8) if from_colour == WHITE else (1, -8)
+            if sq_num // 8 == pr_row and chessboard[sq_num + pawn_move] == EMPTY:
+                pseudolegal_captures.append(sq_num + pawn_move)
+
+        # Piece is a king or a knight (not a ray piece)
+        elif piece_type == KING or piece_type == KNIGHT:
+            for dest_num in (KING_TARGETS if piece_type == KING else KNIGHT_TARGETS)[sq_num]:
+                if chessboard[dest_num] & their_colour:
+                    pseudolegal_captures.append(dest_num)
+
+        # Piece is a bishop, a rook or a queen (ray piece)
+        else:
+            if piece_type == BISHOP:
+                all_rays = BISHOP_RAYS[sq_num]
+            elif piece_type == ROOK:
+                all_rays = ROOK_RAYS[sq_num]
+            else:
+                all_rays = QUEEN_RAYS[sq_num]
+
+            # Only the first piece on the ray can be captured
+            for ray in all_rays:
+                for dest_num in ray:
+                    if chessboard[dest_num] != EMPTY:
+                        if chessboard[dest_num] & their_colour:
+                            pseudolegal_captures.append(dest_num)
+                        break
+
+        return pseudolegal_captures
+
+    def is_in_check(self) -> bool:
+        """Test whether the player to move is in check."""
+
+        chessboard = self._chessboard
+        k_colour = self._to_move
+        their_colour = k_colour ^ COLOUR_MASK
+        k_sq = self._king_squares[k_colour >> 4]
+
+        # Pawn checks
+        for atk_num in PAWN_CAPTURES[k_colour >> 4][k_sq]:
+            if chessboard[atk_num] == their_colour | PAWN:
+                return True
+
+        # "King checks" - illegal moves where both kings are on adjacent squares
+        for atk_num in KING_TARGETS[k_sq]:
+            if chessboard[atk_num] == their_colour | KING:
+                return True
+
+        # Knight checks
+        for atk_num in KNIGHT_TARGETS[k_sq]:
+            if chessboard[atk_num] == their_colour | KNIGHT:
+                return True
+
+        # Bishop, rook and queen (ray piece) checks
+        their_queen = their_colour | QUEEN
+        for all_rays, their_piece in ((BISHOP_RAYS[k_sq], their_colour | BISHOP),
+                                      (ROOK_RAYS[k_sq], their_colour | ROOK)):
+            for ray in all_rays:
+                for atk_num in ray:
+                    atk_piece = chessboard[atk_num]
+                    if atk_piece == EMPTY:
+                        continue
+                    if atk_piece == their_piece or atk_piece == their_queen:
+                        return True
+                    break
+
+        return False
+
+    def get_legal_moves(self, from_num: int) -> List[Tuple[int, int]]:
+        """
+        Return a list of tuples representing legal moves from selected square.
+        """
+        return [(from_num, to_num) for to_num in self._get_legal_targets(from_num)]
+
+    def _get_check_info(self) -> Tuple[int, Set[int], Dict[int, Set[int]]]:
+        """
+        Internal method. Scan the lines leading to the king of the player
+        to move and return a tuple of: the number of pieces giving check,
+        the set of squares which resolve a single check (checker and
+        squares in between, None if not in check) and a dictionary mapping
+        squares of absolutely pinned pieces to the sets of squares
+        they can still move to.
+        """
+        chessboard = self._chessboard
+        colour = self._to_move
+        their_colour = colour ^ COLOUR_MASK
+        k_sq = self._king_squares[colour >> 4]
+        checks = 0
+        block_squares = None
+        pins = {}
+
+        # Pawn and knight checks
+        for atk_nums, their_piece in ((PAWN_CAPTURES[colour >> 4][k_sq], their_colour | PAWN),
+                                      (KNIGHT_TARGETS[k_sq], their_colour | KNIGHT)):
+            for atk_num in atk_nums:
+                if chessboard[atk_num] == their_piece:
+                    checks += 1
+                    block_squares = {atk_num}
+
+        # Bishop, rook and queen (ray piece) checks and pins
+        their_queen = their_colour | QUEEN
+        for all_rays, their_piece in ((BISHOP_RAYS[k_sq], their_colour | BISHOP),
+                                      (ROOK_RAYS[k_sq], their_colour | ROOK)):
+            for ray in all_rays:
+                pinned_num = -1
+                for index, atk_num in enumerate(ray):
+                    atk_piece = chessboard[atk_num]
+                    if atk_piece == EMPTY:
+                        continue
+                    if atk_piece & colour:
+                        # Second piece of ours on the ray - no pin possible
+                        if pinned_num != -1:
+                            break
+                        pinned_num = atk_num
+                        continue
+                    if atk_piece == their_piece or atk_piece == their_queen:
+                        if pinned_num == -1:
+                            checks += 1
+                            block_squares = set(ray[:index + 1])
+                        else:
+                            pins[pinned_num] = set(ray[:index + 1])
+                    break
+
+        return checks, block_squares, pins
+
+    def _get_legal_targets(self, from_num: int,
+                           check_info: Tuple[int, Set[int], Dict[int, Set[int]]] = None,
+                           captures_only: bool = False) -> List[int]:
+        """
+        Internal method. For all normal purposes use get_legal_moves() instead.
+        Return a list of target squares of legal moves from selected square
+        (only captures and promotions if captures_only is set).
+        Pseudolegal moves are filtered using checkers and pins (as returned
+        by _get_check_info(), computed if not given), only king moves and
+        en passant captures are tested by making them on the board.
+        """
+        if captures_only:
+            pseudolegal_moves = self.get_pseudolegal_captures(from_num)
+        else:
+            pseudolegal_moves = self.get_pseudolegal_moves(from_num)
+        if not pseudolegal_moves:
+            return pseudolegal_moves
+
+        from_piece = self._chessboard[from_num]
+        piece_type = from_piece & TYPE_MASK
+
+        # King moves - the attacked squares are not known in advance
+        if piece_type == KING:
+            return [to_num for to_num in pseudolegal_moves
+                    if self._is_king_safe_after(from_num, to_num, from_piece)]
+
+        checks, block_squares, pins = (self._get_check_info() if check_info is None
+                                       else check_info)
+        # Double check - only the king can move
+        if checks > 1:
+            return []
+
+        allowed = pins.get(from_num)
+        if block_squares is not None:
+            allowed = block_squares if allowed is None else allowed & block_squares
+
+        # En passant captures can expose the king by removing two pieces
+        # from a rank, so they are always tested on the board
+        ep_sq = self._ep_square
+        if piece_type == PAWN and ep_sq in pseudolegal_moves:
+            return [to_num for to_num in pseudolegal_moves
+                    if (to_num == ep_sq and
+                        self._is_king_safe_after(from_num, to_num, from_piece)) or
+                    (to_num != ep_sq and (allowed is None or to_num in allowed))]
+
+        if allowed is None:
+            return pseudolegal_moves
+        return [to_num for to_num in pseudolegal_moves if to_num in allowed]
+
+    def _is_legal_move(self, from_num: int, to_num: int) -> bool:
+        """
+        Internal method. Test whether a single move is legal without
+        generating the legal moves of any other piece.
+        """
+        if not (0 <= from_num < 64 and 0 <= to_num < 64):
+            return False
+        from_piece = self._chessboard[from_num]
+        if from_piece == EMPTY or from_piece & COLOUR_MASK != self._to_move:
+            return False
+        if to_num not in self.get_pseudolegal_moves(from_num):
+            return False
+        if from_piece & TYPE_MASK == KING or to_num == self._ep_square:
+            return self._is_king_safe_after(from_num, to_num, from_piece)
+
+        checks, block_squares, pins = self._get_check_info()
+        if checks > 1:
+            return False
+        if block_squares is not None and to_num not in block_squares:
+            return False
+        return from_num not in pins or to_num in pins[from_num]
+
+    def _is_king_safe_after(self, from_num: int, to_num: int, from_piece: int) -> bool:
+        """
+        Internal method. Test whether a pseudolegal move leaves the king
+        out of check (also on the square it passes through when castling)
+        by making it on the board.
+        """
+        to_piece = self._chessboard[to_num]
+
+        # Castling - checking the square that king passes through
+        if from_piece & TYPE_MASK == KING and abs(to_num - from_num) == 2:
+            # Determine if castling kingside or queenside
+            cs_dir = 1 if to_num > from_num else -1
+
+            self._move_piece(from_num, from_num + cs_dir)
+            # Illegal if king is in check on the square it passes through
+            passes_check = self.is_in_check()
+            # Unmove the piece, then proceed as normal
+            self._move_piece(from_num + cs_dir, from_num)
+            if passes_check:
+                return False
+
+        # Move the piece, see whether the king is in check, then unmove it
+        self._move_piece(from_num, to_num)
+        is_safe = not self.is_in_check()
+        self._unmove_piece(from_num, to_num, from_piece, to_piece)
+        return is_safe
+
+    def show_legal_moves(self, sq_num: int) -> None:
+        """Print the board with legal moves from selected square highlighted."""
+
+        sq_set = set((to for fr, to in self._all_legal_moves if fr == sq_num))
+        print(self.__str__(highlit_squares=sq_set))
+
+    def show_piece_positions(self, colour: str) -> None:
+        """Show piece positions on the output"""
+
+        piece_positions = set(self._piece_lists[1 if colour == 'b' else 0])
+        print(self.__str__(highlit_squares=piece_positions))
+
+    @property
+    def _all_legal_moves(self) -> List[Tuple[int, int]]:
+        """
+        List of all legal moves in position. Generated on first access after
+        the position has changed, then cached.
+        """
+        if self._legal_moves_dirty:
+            self._legal_moves_cache = self.get_all_legal_moves()
+            self._legal_moves_dirty = False
+        return self._legal_moves_cache
+
+    def has_legal_moves(self) -> bool:
+        """
+        Test whether the side to move has any legal move, stopping at the 
+        first piece which has one rather than generating all of them.
+        """
+        if not self._legal_moves_dirty:
+            return len(self._legal_moves_cache) > 0
+        check_info = self._get_check_info()
+        for sq_num in self._piece_lists[self._to_move >> 4]:
+            if self._get_legal_targets(sq_num, check_info):
+                return True
+        return False
+
+    def get_all_legal_moves(self) -> List[Tuple[int, int]]:
+        """Return a list of tuples representing all legal moves in position."""
+
+        all_legal_moves = []
+        check_info = self._get_check_info()
+        for sq_num in self._piece_lists[self._to_move >> 4]:
+            for to_num in self._get_legal_targets(sq_num, check_info):
+                all_legal_moves.append((sq_num, to_num))
+
+        return all_legal_moves
+
+    def generate_moves(self, move_list: MoveList) -> int:
+        """
+        Fill the given move list with all legal moves in position as packed
+        integers (see encode_move()), promotions expanded to every piece.
+        Returns the number of moves.
+        """
+        move_list.clear()
+        append = move_list.append
+        chessboard = self._chessboard
+        ep_sq = self._ep_square
+        promotion_row = 6 if self._to_move == WHITE else 1
+        check_info = self._get_check_info()
+        for sq_num in self._piece_lists[self._to_move >> 4]:
+            piece_type = chessboard[sq_num] & TYPE_MASK
+            for to_num in self._get_legal_targets(sq_num, check_info):
+                if piece_type == PAWN:
+                    if sq_num // 8 == promotion_row:
+                        for promotion in (3, 2, 1, 0):
+                            append(sq_num | to_num << 6 | MOVE_PROMOTION << 12 |
+                                   promotion << 14)
+                    elif to_num == ep_sq:
+                        append(sq_num | to_num << 6 | MOVE_EN_PASSANT << 12)
+                    else:
+                        append(sq_num | to_num << 6)
+                elif piece_type == KING and abs(to_num - sq_num) == 2:
+                    append(sq_num | to_num << 6 | MOVE_CASTLING << 12)
+                else:
+                    append(sq_num | to_num << 6)
+        return len(move_list)
+
+    def get_legal_captures(self) -> List[Tuple[int, int]]:
+        """
+        Return a list of tuples representing all legal captures (en passant 
+        included) and promotions in position.
+        """
+        legal_captures = []
+        check_info = self._get_check_info()
+        for sq_num in self._piece_lists[self._to_move >> 4]:
+            for to_num in self._get_legal_targets(sq_num, check_info, True):
+                legal_captures.append((sq_num, to_num))
+
+        return legal_captures
+
+    def generate_captures(self, move_list: MoveList) -> int:
+        """
+        Fill the given move list with all legal captures and promotions in 
+        position as packed integers, encoded as by generate_moves().
+        Returns the number of moves.
+        """
+        move_list.clear()
+        append = move_list.append
+        chessboard = self._chessboard
+        ep_sq = self._ep_square
+        promotion_row = 6 if self._to_move == WHITE else 1
+        check_info = self._get_check_info()
+        for sq_num in self._piece_lists[self._to_move >> 4]:
+            is_pawn = chessboard[sq_num] & TYPE_MASK == PAWN
+            for to_num in self._get_legal_targets(sq_num, check_info, True):
+                if is_pawn and sq_num // 8 == promotion_row:
+                    for promotion in (3, 2, 1, 0):
+                        append(sq_num | to_num << 6 | MOVE_PROMOTION << 12 | 
+                               promotion << 14)
+                elif is_pawn and to_num == ep_sq:
+                    append(sq_num | to_num << 6 | MOVE_EN_PASSANT << 12)
+                else:
+                    append(sq_num | to_num << 6)
+        return len(move_list)
+
+    def make_packed_move(self, move: int, perft_mode: bool = False) -> None:
+        """Make a move given as a packed integer (see make_move())."""
+
+        self.make_move(*decode_move(move), perft_mode)
+
+    def make_move(self, from_num: int, to_num: int,
+                  promote_to: str = 'q', perft_mode: bool = False) -> None:
+        """
+        Make a permanent move. Increments the halfmove clock as well as
+        the fullmove counter, changes the en passant target square,
+        removes castling rights.
+        """
+        chessboard = self._chessboard
+        if not perft_mode:
+            if not self._is_legal_move(from_num, to_num):
+                print(f'DEBUG: Illegal move: {PIECE_CHARS[chessboard[from_num]]} on {self.num_to_alg(from_num)} -> {PIECE_CHARS[chessboard[to_num]]} on {self.num_to_alg(to_num)}')
+                print(f'\tPrevious move: {self._move_history[-1] if len(self._move_history) > 0 else "NONE"}')
+                return None
+
+        # Store board properties before making the move
+        cn_cs = self._castling
+        ep_sq = self._ep_square
+        hm_cl = self._halfmove_clock
+        fm_ct = self._fullmove_counter
+        zb_key = self._zobrist_key
+
+        from_piece = chessboard[from_num]
+        to_piece = chessboard[to_num]
+        captured_index = self._get_captured_index(from_num, to_num)
+
+        move_type = self._make_move_state(from_num, to_num, PROMOTION_TYPES[promote_to])
+
+        # Update the list of previous moves
+        history = self._move_history
+        if len(history) < len(self._undo_pool):
+            record = self._undo_pool[len(history)]
+        else:
+            record = UndoRecord()
+            self._undo_pool.append(record)
+        record.from_num = from_num
+        record.to_num = to_num
+        record.from_piece = from_piece
+        record.to_piece = to_piece
+        record.captured_index = captured_index
+        record.move_type = move_type
+        record.castling = cn_cs
+        record.ep_square = ep_sq
+        record.halfmove_clock = hm_cl
+        record.fullmove_counter = fm_ct
+        record.zobrist_key = zb_key
+        history.append(record)
+
+    def _make_move_state(self, from_num: int, to_num: int, promote_to: int) -> int:
+        """
+        Internal method shared by make_move() and make_move_unrecorded().
+        Move the piece and update everything the move changes apart from
+        the move history: castling rights, clocks, side to move, en passant
+        square, hash key and the key history. Returns the move type.
+        """
+        chessboard = self._chessboard
+        cn_cs = self._castling
+        ep_sq = self._ep_square
+        from_piece = chessboard[from_num]
+        to_piece = chessboard[to_num]
+
+        # Detecting loss of castling rights
+        self._castling = cn_cs & CASTLING_MASK[from_num] & CASTLING_MASK[to_num]
+
+        # Move the piece and check whether to reset the halfmove clock
+        reset_hm_cl, move_type = self._move_piece(from_num, to_num, promote_to, True)
+
+        # Update the hash key: moved (possibly promoted) and captured pieces
+        zb_key = (self._zobrist_key ^ ZOBRIST_PIECES[from_piece][from_num] ^
+                  ZOBRIST_PIECES[chessboard[to_num]][to_num] ^
+                  ZOBRIST_PIECES[to_piece][to_num])
+        if move_type == MOVE_EN_PASSANT:
+            ep_pawn_sq = to_num - 8 if to_num > from_num else to_num + 8
+            zb_key ^= ZOBRIST_PIECES[from_piece ^ COLOUR_MASK][ep_pawn_sq]
+        elif move_type == MOVE_CASTLING:
+            rook_from, rook_to = ((from_num + 3, from_num + 1) if to_num > from_num
+                                  else (from_num - 4, from_num - 1))
+            rook_keys = ZOBRIST_PIECES[(from_piece & COLOUR_MASK) | ROOK]
+            zb_key ^= rook_keys[rook_from] ^ rook_keys[rook_to]
+        # Castling rights, side to move
+        zb_key ^= ZOBRIST_CASTLING_RIGHTS[cn_cs ^ self._castling] ^ ZOBRIST_BLACK_TO_MOVE
+
+        if reset_hm_cl > 0:
+            self._halfmove_clock = 0
+        else:
+            self._halfmove_clock += 1
+
+        if self._to_move == BLACK:
+            self._fullmove_counter += 1
+
+        self._to_move ^= COLOUR_MASK
+
+        # Update the list of previous positions
+        self._key_history.append(self._zobrist_key)
+
+        # Detecting possibility of en passant in next ply
+        if from_piece & TYPE_MASK == PAWN and abs(to_num - from_num) == 16:
+            self._ep_square = (from_num + to_num) // 2
+        else:
+            self._ep_square = -1
+
+        # En passant square
+        if ep_sq != -1:
+            zb_key ^= ZOBRIST_EP_FILE[ep_sq % 8]
+        if self._ep_square != -1:
+            zb_key ^= ZOBRIST_EP_FILE[self._ep_square % 8]
+        self._zobrist_key = zb_key
+
+        # Invalidate the list of legal moves (game end is detected by the 
+        # callers needing it, see detect_game_end())
+        self._legal_moves_dirty = True
+        return move_type
+
+    def unmake_move(self) -> None:
+        """Unmake the last move made using the make_move() function."""
+
+        if len(self._move_history) == 0:
+            print('DEBUG: Nothing to unmake')
+            return None
+
+        # Update the list of previous moves and positions
+        record = self._move_history.pop()
+        self._key_history.pop()
+
+        # Reinstate previous board properties
+        self._castling = record.castling
+        self._ep_square = record.ep_square
+        self._halfmove_clock = record.halfmove_clock
+        self._fullmove_counter = record.fullmove_counter
+        self._zobrist_key = record.zobrist_key
+
+        # Unmake the move
+        self._unmove_piece(record.from_num, record.to_num, record.from_piece,
+                           record.to_piece, True, record.captured_index)
+
+        # Change the player to move
+        self._to_move ^= COLOUR_MASK
+
+        # Invalidate the list of legal moves
+        self._legal_moves_dirty = True
+
+    def make_move_unrecorded(self, move: int) -> None:
+        """
+        Make a legal packed move without recording it for unmake_move(): 
+        no undo record or move history entry is kept (only the hash key, 
+        for repetition detection), so it can only be taken back by 
+        pop_state(). This is the make half of copy-make.
+        """
+        self._make_move_state(move & 63, move >> 6 & 63, KNIGHT + (move >> 14))
+
+    def push_state(self) -> None:
+        """
+        Save the whole position on the state stack, so that the moves made
+        after (with make_move_unrecorded(), or make_move()) can be taken back
+        at once by pop_state(), instead of one by one by unmake_move(). The 
+        state records are allocated on first use and reused after.
+        """
+        if self._state_depth == len(self._state_stack):
+            self._state_stack.append(BoardState())
+        state = self._state_stack[self._state_depth]
+        self._state_depth += 1
+
+        state.chessboard[:] = self._chessboard
+        state.piece_lists[0][:] = self._piece_lists[0]
+        state.piece_lists[1][:] = self._piece_lists[1]
+        state.piece_index[:] = self._piece_index
+        state.king_squares[:] = self._king_squares
+        state.to_move = self._to_move
+        state.castling = self._castling
+        state.ep_square = self._ep_square
+        state.halfmove_clock = self._halfmove_clock
+        state.fullmove_counter = self._fullmove_counter
+        state.zobrist_key = self._zobrist_key
+        state.eval_mg = self._eval_mg
+        state.eval_eg = self._eval_eg
+        state.phase = self._phase
+        state.history_length = len(self._move_history)
+        state.key_history_length = len(self._key_history)
+
+    def pop_state(self) -> None:
+        """
+        Restore the position saved by the last push_state(), dropping the
+        moves made since from the history.
+        """
+        if self._state_depth == 0:
+            print('DEBUG: No state to pop')
+            return None
+        self._state_depth -= 1
+        state = self._state_stack[self._state_depth]
+
+        self._chessboard[:] = state.chessboard
+        self._piece_lists[0][:] = state.piece_lists[0]
+        self._piece_lists[1][:] = state.piece_lists[1]
+        self._piece_index[:] = state.piece_index
+        self._king_squares[:] = state.king_squares
+        self._to_move = state.to_move
+        self._castling = state.castling
+        self._ep_square = state.ep_square
+        self._halfmove_clock = state.halfmove_clock
+        self._fullmove_counter = state.fullmove_counter
+        self._zobrist_key = state.zobrist_key
+        self._eval_mg = state.eval_mg
+        self._eval_eg = state.eval_eg
+        self._phase = state.phase
+        del self._move_history[state.history_length:]
+        del self._key_history[state.key_history_length:]
+
+        # Invalidate the list of legal moves
+        self._legal_moves_dirty = True
+
+    def detect_game_end(self, verbose: bool = False) -> int:
+        """
+        Detect and handle game ending states - checkmates and draws.
+        Returns 1 if checkmate, 2 if stalemate, 3 if fifty-move rule,
+        4 if threefold repetition, 5 if insufficient material, 0 otherwise.
+        """
+        if not self.has_legal_moves():
+            if self.is_in_check():
+                if verbose:
+                    colour = 'White' if self._to_move == BLACK else 'Black'
+                    print(f'Checkmate. {colour} wins')
+                return 1
+            else:
+                if verbose:
+                    print('Stalemate')
+                return 2
+        if self._halfmove_clock >= 100:
+            if verbose:
+                print('Draw by the fifty-move rule')
+            return 3
+        if self.is_repetition():
+            if verbose:
+                print('Draw by threefold repetition')
+            return 4
+        if self.has_insufficient_material():
+            if verbose:
+                print('Draw by insufficient material')
+            return 5
+        return 0
+
+    def is_repetition(self, times: int = 3) -> bool:
+        """
+        Test whether the current position has occurred given number of times
+        (current one included) in the moves made. Only positions since the
+        last capture or pawn move are compared, so this is cheap enough to be 
+        called at every search node.
+        """
+        keys = self._key_history
+        zb_key = self._zobrist_key
+        count = 1
+        # Same player to move every second ply, scanning back no further
+        # than the last irreversible move
+        stop = max(len(keys) - self._halfmove_clock, 0)
+        for index in range(len(keys) - 2, stop - 1, -2):
+            if keys[index] == zb_key:
+                count += 1
+                if count >= times:
+                    return True
+        return False
+
+    def has_insufficient_material(self) -> bool:
+        """
+        Test whether neither player can checkmate: only kings left, plus 
+        a single knight or bishop, or any number of bishops all on squares
+        of the same colour.
+        """
+        chessboard = self._chessboard
+        minors = []
+        # Both piece lists are scanned in place (no concatenated copy), as
+        # this is called at every search node and mostly returns at once
+        for colour_pieces in self._piece_lists:
+            for sq_num in colour_pieces:
+                piece_type = chessboard[sq_num] & TYPE_MASK
+                if piece_type in (PAWN, ROOK, QUEEN):
+                    return False
+                if piece_type != KING:
+                    minors.append((piece_type, sq_num))
+
+        if len(minors) <= 1:
+            return True
+        # Bishops only, all on light or all on dark squares
+        square_colours = set((sq_num // 8 + sq_num) % 2 for _, sq_num in minors)
+        return (all(piece_type == BISHOP for piece_type, _ in minors) and 
+                len(square_colours) == 1)
+
+    def is_draw(self, repetitions: int = 3) -> bool:
+        """
+        Test whether the game is drawn by the fifty-move rule, repetition 
+        (the position occurring given number of times) or insufficient 
+        material. Stalemate is not detected.
+        """
+        return (self._halfmove_clock >= 100 or self.is_repetition(repetitions) or 
+                self.has_insufficient_material())
+
+    def probe_bitbase(self) -> Optional[int]:
+        """
+        Return the result of the position with perfect play according to
+        the endgame bitbases, from the point of view of the side to move:
+        1 if won, -1 if lost, 0 if drawn, or None if the position is not
+        covered (only king and pawn against king is, see bitbase.py).
+        """
+        global _probe_kpk
+        if len(self._piece_lists[0]) + len(self._piece_lists[1]) != 3:
+            return None
+        if _probe_kpk is None:
+            from .bitbase import probe_kpk as _probe_kpk
+        return _probe_kpk(self)
+
+    def perft(self, depth: int, hash_mb: int = 0, copy_make: bool = False) -> int:
+        """
+        Return number of leaf nodes (possible positions after all legal moves)
+        at set depth from current position. If hash_mb is set, subtrees 
+        reached by transpositions are cached in a table of that size 
+        (see _perft_hashed(); only used from depth 5 on). If copy_make is set, moves are taken back
+        with pop_state() instead of unmake_move() (see _perft_copy_make();
+        not faster, see BoardState).
+        """
+        if depth < 0:
+            raise ValueError('Negative depth')
+        if hash_mb > 0:
+            # Shallow runs never reach the hashed nodes, so the table is not
+            # even allocated
+            if depth < PERFT_HASH_MIN_PLY + 2:
+                self._perft_table = None
+                return self.perft(depth, 0, copy_make)
+            self._perft_table = PerftTable(hash_mb)
+            return self._perft_hashed(depth, copy_make)
+        if copy_make:
+            return self._perft_copy_make(depth)
+        if depth == 0:
+            return 1
+
+        moves = self._get_move_buffer(depth)
+        self.generate_moves(moves)
+        if depth == 1:
+            return len(moves)
+
+        leaf_nodes = 0
+        if depth == 2:
+            for move in moves:
+                leaf_nodes += self._count_child_moves(*decode_move(move))
+            return leaf_nodes
+
+        for move in moves:
+            self.make_move(*decode_move(move), True)
+            leaf_nodes += self.perft(depth - 1)
+            self.unmake_move()
+        return leaf_nodes
+
+    def _perft_hashed(self, depth: int, copy_make: bool = False, ply: int = 0) -> int:
+        """
+        Internal method. For all normal purposes use perft(depth, hash_mb).
+        Perft with node counts cached in self._perft_table for nodes at least
+        PERFT_HASH_MIN_PLY plies from the root (nearer ones cannot be reached
+        by transpositions) and down to the depth 2 frontier (depth 1 counts
+        are cheaper to compute than to look up). Runs shallower than 
+        PERFT_HASH_MIN_PLY + 2 therefore never touch the table, and the 
+        table only pays off in deep perft (start position depth 6 and beyond).
+        """
+        if depth < 2:
+            return self._perft_copy_make(depth) if copy_make else self.perft(depth)
+
+        hashed = ply >= PERFT_HASH_MIN_PLY
+        table = self._perft_table
+        zb_key = self._zobrist_key
+        if hashed:
+            leaf_nodes = table.probe(zb_key, depth)
+            if leaf_nodes != -1:
+                return leaf_nodes
+
+        if depth == 2:
+            leaf_nodes = self._perft_copy_make(2) if copy_make else self.perft(2)
+        else:
+            leaf_nodes = 0
+            moves = self._get_move_buffer(depth)
+            self.generate_moves(moves)
+            for move in moves:
+                if copy_make:
+                    self.push_state()
+                    self.make_move_unrecorded(move)
+                    leaf_nodes += self._perft_hashed(depth - 1, True, ply + 1)
+                    self.pop_state()
+                else:
+                    self.make_move(*decode_move(move), True)
+                    leaf_nodes += self._perft_hashed(depth - 1, False, ply + 1)
+                    self.unmake_move()
+
+        if hashed:
+            table.store(zb_key, depth, leaf_nodes)
+        return leaf_nodes
+
+    def _perft_copy_make(self, depth: int) -> int:
+        """
+        Internal method. For all normal purposes use perft(depth, copy_make=True).
+        Perft saving the position with push_state() before every move, made
+        with make_move_unrecorded(), and restoring it with pop_state() after,
+        at the frontier as well.
+        """
+        if depth == 0:
+            return 1
+
+        moves = self._get_move_buffer(depth)
+        self.generate_moves(moves)
+        if depth == 1:
+            return len(moves)
+
+        leaf_nodes = 0
+        for move in moves:
+            self.push_state()
+            self.make_move_unrecorded(move)
+            if depth == 2:
+                leaf_nodes += self._count_legal_moves()
+            else:
+                leaf_nodes += self._perft_copy_make(depth - 1)
+            self.pop_state()
+        return leaf_nodes
+
+    def _get_move_buffer(self, depth: int) -> MoveList:
+        """
+        Internal method. Return the move list reserved for nodes at given 
+        remaining depth, allocating it on first use.
+        """
+        while len(self._move_buffers) <= depth:
+            self._move_buffers.append(MoveList())
+        return self._move_buffers[depth]
+
+    def _count_legal_moves(self) -> int:
+        """
+        Internal method. Return the number of legal moves in position 
+        (each promotion counted once per piece) without building the list.
+        """
+        counter = 0
+        promotion_row = 6 if self._to_move == WHITE else 1
+        check_info = self._get_check_info()
+        for sq_num in self._piece_lists[self._to_move >> 4]:
+            targets = self._get_legal_targets(sq_num, check_info)
+            if sq_num // 8 == promotion_row and self._chessboard[sq_num] & TYPE_MASK == PAWN:
+                counter += 4 * len(targets)
+            else:
+                counter += len(targets)
+        return counter
+
+    def _count_child_moves(self, from_num: int, to_num: int, promote_to: str) -> int:
+        """
+        Internal method used by perft() at the frontier. Return the number 
+        of legal moves after the given move, updating only the state 
+        needed for move generation (no history, hash or legal move list).
+        """
+        chessboard = self._chessboard
+        from_piece = chessboard[from_num]
+        to_piece = chessboard[to_num]
+        cn_cs = self._castling
+        ep_sq = self._ep_square
+        captured_index = self._get_captured_index(from_num, to_num)
+
+        self._castling = cn_cs & CASTLING_MASK[from_num] & CASTLING_MASK[to_num]
+        self._move_piece(from_num, to_num, PROMOTION_TYPES[promote_to], True)
+        self._to_move ^= COLOUR_MASK
+        if from_piece & TYPE_MASK == PAWN and abs(to_num - from_num) == 16:
+            self._ep_square = (from_num + to_num) // 2
+        else:
+            self._ep_square = -1
+
+        counter = self._count_legal_moves()
+
+        # Restore the position (ep square first, _unmove_piece() relies on it)
+        self._to_move ^= COLOUR_MASK
+        self._ep_square = ep_sq
+        self._castling = cn_cs
+        self._unmove_piece(from_num, to_num, from_piece, to_piece, True, captured_index)
+        return counter
+
+    def divide(self, depth: int) -> Dict[str, int]:
+        """Perft variation listing the node counts for each possible move."""
+
+        if depth < 1:
+            return {}
+
+        leaf_nodes_dict = {}
+        for move_str, move_args in self._root_moves():
+            self.make_move(*move_args, True)
+            leaf_nodes_dict[move_str] = self.perft(depth - 1)
+            self.unmake_move()
+
+        return leaf_nodes_dict
+
+    def perft_parallel(self, depth: int, workers: int = 0, 
+                       hash_mb: int = 0, copy_make: bool = False) -> int:
+        """
+        Perft split across a pool of worker processes (all CPUs if workers 
+        not specified). See divide_parallel().
+        """
+        if depth < 2:
+            return self.perft(depth, 0, copy_make)
+        return sum(self.divide_parallel(depth, workers, hash_mb, copy_make).values())
+
+    def divide_parallel(self, depth: int, workers: int = 0, 
+                        hash_mb: int = 0, copy_make: bool = False) -> Dict[str, int]:
+        """
+        Divide split across a pool of worker processes (all CPUs if workers 
+        not specified). Positions after each root move (promotions included) 
+        are sent to the workers packed into bytes (see to_bytes()). If there are too few root 
+        moves to keep every worker busy, the positions one ply deeper are 
+        sent instead. Tasks are handed out one at a time, so idle workers 
+        keep picking up the remaining subtrees until all are done. Every 
+        worker uses its own perft table of hash_mb, and copy-make if set.
+        """
+        if depth < 2:
+            return self.divide(depth)
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+
+        # Positions after the root moves
+        root_moves = self._root_moves()
+        tasks = []
+        for move_str, move_args in root_moves:
+            self.make_move(*move_args, True)
+            tasks.append((move_str, self.to_bytes(), depth - 1, hash_mb, copy_make))
+            self.unmake_move()
+
+        # Split one ply deeper for better load balancing
+        if len(tasks) < 4 * workers and depth > 2:
+            split_tasks = []
+            for move_str, data, sub_depth, _, _ in tasks:
+                sub_board = Board.from_bytes(data)
+                for _, move_args in sub_board._root_moves():
+                    sub_board.make_move(*move_args, True)
+                    split_tasks.append((move_str, sub_board.to_bytes(), 
+                                        sub_depth - 1, hash_mb, copy_make))
+                    sub_board.unmake_move()
+            tasks = split_tasks
+
+        # Merge results, keeping the move order of the sequential divide()
+        leaf_nodes_dict = {move_str: 0 for move_str, _ in root_moves}
+        # Importing multiprocessing would more than double the import time
+        # of this module, and only the parallel perft needs it
+        from multiprocessing import Pool
+        with Pool(workers) as pool:
+            for move_str, count in pool.imap_unordered(_perft_worker, tasks):
+                leaf_nodes_dict[move_str] += count
+
+        return leaf_nodes_dict
+
+    def _root_moves(self) -> List[Tuple[str, Tuple[int, int, str]]]:
+        """
+        Return a list of all legal moves in position as tuples of a move 
+        string (as printed by divide()) and make_move() arguments, 
+        with promotions expanded to every piece.
+        """
+        root_moves = []
+        for move_from, move_to in self._all_legal_moves:
+            move_str = SQUARE_NAMES[move_from] + SQUARE_NAMES[move_to]
+            # Handling promotions
+            if self._chessboard[move_from] & TYPE_MASK == PAWN and move_to // 8 in (0, 7):
+                for promote_to in ('q', 'r', 'b', 'n'):
+                    root_moves.append((move_str + promote_to.upper(), 
+                                       (move_from, move_to, promote_to)))
+            else:
+                root_moves.append((move_str, (move_from, move_to, 'q')))
+        return root_moves
+
+    def _move_piece(self, from_num: int, to_num: int, promote_to: int = QUEEN,
+                    update_state: bool = False) -> Tuple[int, int]:
+        """
+        Internal method. For all normal purposes use make_move() instead.
+        Move a single piece (numerical coordinates), promoting pawns to
+        the promote_to piece type. If update_state is set, the piece lists 
+        and the incremental evaluation are updated as well. Returns a tuple 
+        of two values, the first one is positive if move resets the halfmove
+        counter: 1 - pawn move, 2 - capture, 0 - neither; the second one is 
+        the type of move, one of MOVE_QUIET (can be a capture), MOVE_CASTLING, 
+        MOVE_EN_PASSANT or MOVE_PROMOTION.
+        """
+        reset_hm_cl = 0
+        move_type = MOVE_QUIET
+        chessboard = self._chessboard
+        from_piece = chessboard[from_num]
+        to_piece = chessboard[to_num]
+        from_colour = from_piece & COLOUR_MASK
+        piece_type = from_piece & TYPE_MASK
+
+        if from_piece == EMPTY:
+            print(f'DEBUG: Square {from_num} is empty')
+            return None
+
+        # Standard capture
+        if to_piece != EMPTY:
+            reset_hm_cl = 2
+            if update_state:
+                self._update_piece_lists(from_colour ^ COLOUR_MASK, to_num, -1)
+
+        if piece_type == KING:
+            self._king_squares[from_colour >> 4] = to_num
+            # Handling castling moves
+            if from_num in (4, 60) and abs(to_num - from_num) == 2:
+                move_type = MOVE_CASTLING
+
+                if to_num > from_num: # castling kingside
+                    rook_from = from_num + 3
+                    rook_to = from_num + 1
+                else: # castling queenside
+                    rook_from = from_num - 4
+                    rook_to = from_num - 1
+
+                rook = chessboard[rook_from]
+                chessboard[rook_to] = rook
+                chessboard[rook_from] = EMPTY
+
+                if update_state:
+                    self._update_piece_lists(from_colour, rook_from, rook_to)
+                    self._eval_mg += EVAL_MG[rook][rook_to] - EVAL_MG[rook][rook_from]
+                    self._eval_eg += EVAL_EG[rook][rook_to] - EVAL_EG[rook][rook_from]
+
+        elif piece_type == PAWN:
+            # Handling promotions
+            if to_num // 8 in (0, 7):
+                move_type = MOVE_PROMOTION
+                chessboard[to_num] = from_colour | promote_to
+
+            # Handling en passant
+            elif to_num == self._ep_square:
+                move_type = MOVE_EN_PASSANT
+                ep_pawn_sq = to_num - 8 if to_num > from_num else to_num + 8
+                to_piece = chessboard[ep_pawn_sq]
+                chessboard[ep_pawn_sq] = EMPTY
+
+                if update_state:
+                    self._update_piece_lists(from_colour ^ COLOUR_MASK, ep_pawn_sq, -1)
+                    self._eval_mg -= EVAL_MG[to_piece][ep_pawn_sq]
+                    self._eval_eg -= EVAL_EG[to_piece][ep_pawn_sq]
+                to_piece = EMPTY
+
+            reset_hm_cl = 1
+
+        # Actually move the piece
+        if move_type != MOVE_PROMOTION:
+            chessboard[to_num] = from_piece
+        chessboard[from_num] = EMPTY
+
+        if update_state:
+            self._update_piece_lists(from_colour, from_num, to_num)
+            # Moved (possibly promoted) and captured pieces
+            to_piece_after = chessboard[to_num]
+            self._eval_mg += (EVAL_MG[to_piece_after][to_num] - EVAL_MG[from_piece][from_num] - 
+                              EVAL_MG[to_piece][to_num])
+            self._eval_eg += (EVAL_EG[to_piece_after][to_num] - EVAL_EG[from_piece][from_num] - 
+                              EVAL_EG[to_piece][to_num])
+            self._phase += (PHASE_VALUES[to_piece_after] - PHASE_VALUES[from_piece] - 
+                            PHASE_VALUES[to_piece])
+
+        return (reset_hm_cl, move_type)
+
+    def _unmove_piece(self, from_num: int, to_num: int, from_piece: int,
+                      to_piece: int, update_state: bool = False,
+                      captured_index: int = -1) -> None:
+        """
+        Internal method. For all normal purposes use unmake_move() instead.
+        Undo a move made using the _move_piece(from_num, to_num) method,
+        given the piece codes previously on both squares. Relies on the en
+        passant square being restored first. If update_state is set, the 
+        incremental evaluation is restored and a captured piece is put back 
+        at captured_index in its piece list (see _get_captured_index()).
+        """
+        chessboard = self._chessboard
+        from_colour = from_piece & COLOUR_MASK
+        piece_type = from_piece & TYPE_MASK
+
+        if update_state:
+            # Moved (possibly promoted) and captured pieces
+            to_piece_after = chessboard[to_num]
+            self._eval_mg += (EVAL_MG[from_piece][from_num] + EVAL_MG[to_piece][to_num] - 
+                              EVAL_MG[to_piece_after][to_num])
+            self._eval_eg += (EVAL_EG[from_piece][from_num] + EVAL_EG[to_piece][to_num] - 
+                              EVAL_EG[to_piece_after][to_num])
+            self._phase += (PHASE_VALUES[from_piece] + PHASE_VALUES[to_piece] - 
+                            PHASE_VALUES[to_piece_after])
+
+        # Put both pieces back (also undoes a promotion)
+        chessboard[from_num] = from_piece
+        chessboard[to_num] = to_piece
+
+        # Move the piece back in the list first, the captured piece will
+        # then take its square
+        if update_state:
+            self._update_piece_lists(from_colour, to_num, from_num)
+
+        # Move was a standard capture
+        if to_piece != EMPTY:
+            if update_state:
+                self._update_piece_lists(from_colour ^ COLOUR_MASK, -1, to_num,
+                                         captured_index)
+
+        # Handling en passant
+        elif piece_type == PAWN and to_num == self._ep_square:
+            ep_pawn_sq = to_num - 8 if to_num > from_num else to_num + 8
+            ep_pawn = (from_colour ^ COLOUR_MASK) | PAWN
+            chessboard[ep_pawn_sq] = ep_pawn
+
+            if update_state:
+                self._update_piece_lists(from_colour ^ COLOUR_MASK, -1, ep_pawn_sq,
+                                         captured_index)
+                self._eval_mg += EVAL_MG[ep_pawn][ep_pawn_sq]
+                self._eval_eg += EVAL_EG[ep_pawn][ep_pawn_sq]
+
+        # Handling castling moves
+        elif piece_type == KING and abs(to_num - from_num) == 2:
+            if to_num > from_num: # castling kingside
+                rook_from = from_num + 3
+                rook_to = from_num + 1
+            else: # castling queenside
+                rook_from = from_num - 4
+                rook_to = from_num - 1
+
+            rook = chessboard[rook_to]
+            chessboard[rook_from] = rook
+            chessboard[rook_to] = EMPTY
+
+            if update_state:
+                self._update_piece_lists(from_colour, rook_to, rook_from)
+                self._eval_mg += EVAL_MG[rook][rook_from] - EVAL_MG[rook][rook_to]
+                self._eval_eg += EVAL_EG[rook][rook_from] - EVAL_EG[rook][rook_to]
+
+        # Update king position
+        if piece_type == KING:
+            self._king_squares[from_colour >> 4] = from_num
+
+    def _rebuild_piece_lists(self) -> None:
+        """
+        Internal method. Create the piece lists, the square -> list index map
+        and the king squares from the board, scanning in FEN order.
+        """
+        self._piece_lists = [[], []]
+        self._piece_index = [-1] * 64
+        for sq_row in range(7, -1, -1):
+            for sq_num in range(sq_row*8, sq_row*8 + 8):
+                piece = self._chessboard[sq_num]
+                if piece == EMPTY:
+                    continue
+                if piece & TYPE_MASK == KING:
+                    self._king_squares[piece >> 4] = sq_num
+                self._update_piece_lists(piece & COLOUR_MASK, -1, sq_num)
+
+    def _compute_eval(self) -> Tuple[int, int, int]:
+        """
+        Compute the evaluation terms (middlegame score, endgame score, game 
+        phase) of the position from scratch.
+        """
+        eval_mg = eval_eg = phase = 0
+        for sq_num, piece in enumerate(self._chessboard):
+            eval_mg += EVAL_MG[piece][sq_num]
+            eval_eg += EVAL_EG[piece][sq_num]
+            phase += PHASE_VALUES[piece]
+        return eval_mg, eval_eg, phase
+
+    def _compute_zobrist_key(self) -> int:
+        """Compute the Zobrist hash key of the position from scratch."""
+
+        zb_key = 0
+        for sq_num, piece in enumerate(self._chessboard):
+            zb_key ^= ZOBRIST_PIECES[piece][sq_num]
+        zb_key ^= ZOBRIST_CASTLING_RIGHTS[self._castling]
+        if self._ep_square != -1:
+            zb_key ^= ZOBRIST_EP_FILE[self._ep_square % 8]
+        if self._to_move == BLACK:
+            zb_key ^= ZOBRIST_BLACK_TO_MOVE
+        return zb_key
+
+    def _update_piece_lists(self, colour: int, sq_from: int, sq_to: int,
+                            index: int = -1) -> int:
+        """
+        Update the piece list of given colour in constant time, using the
+        square -> list index map. Adds a piece if sq_from is -1, removes it
+        if sq_to is -1, moves it otherwise. Returns the list index of the
+        piece. A removed piece's slot is filled with the last piece in the
+        list; passing the returned index when adding the piece back undoes
+        that, restoring the previous order.
+        """
+        p_list = self._piece_lists[colour >> 4]
+        piece_index = self._piece_index
+
+        if sq_from == -1:
+            if index == -1 or index == len(p_list):
+                index = len(p_list)
+                p_list.append(sq_to)
+            else:
+                displaced = p_list[index]
+                piece_index[displaced] = len(p_list)
+                p_list.append(displaced)
+                p_list[index] = sq_to
+            piece_index[sq_to] = index
+            return index
+
+        index = piece_index[sq_from]
+        if index == -1:
+            print('DEBUG: Piece not found in list')
+            return -1
+        piece_index[sq_from] = -1
+
+        if sq_to == -1:
+            last = p_list.pop()
+            if index < len(p_list):
+                p_list[index] = last
+                piece_index[last] = index
+        else:
+            p_list[index] = sq_to
+            piece_index[sq_to] = index
+        return index
+
+    def _get_captured_index(self, from_num: int, to_num: int) -> int:
+        """
+        Return the piece list index of the piece captured by a move
+        (en passant included), -1 if the move is not a capture.
+        """
+        if self._chessboard[to_num] != EMPTY:
+            return self._piece_index[to_num]
+        if to_num == self._ep_square and self._chessboard[from_num] & TYPE_MASK == PAWN:
+            return self._piece_index[to_num - 8 if to_num > from_num else to_num + 8]
+        return -1
+
@@ -0,0 +1,165 @@
+from time import time
+
+from .board import Board, MoveList
+from .notation import moves_to_san
+
+
+# Strings for interactive command prompt mode
+LOGO_STR = """
+       #   #
+      ##########                                    #
+    ## ############                                 #
+   ######### ########       ##   #   #  ###    ###  ###    ##     ##   ##
+  # #####   ##########     #  #  #   #  #  #  #     #  #  #  #   #    #
+  ####      ###########    #  #  # # #  #  #  #     #  #  ##      #    #
+            ############    ##    # #   #  #   ###  #  #   ###  ###  ###
+           #############
+          ##############       b  o  a  r  d        m  o  d  u  l  e\n"""
+HELP_STR = """Available commands:\n\tq - exit\n\th - show this message
+\tb - show board\n\tf [FEN] - set FEN, initial position if no FEN given
+\tf get - get FEN of current position
+\tl [square] - show legal moves from set square, print all if no square given
+\tc - is current player in check\n\tm <square_from> <square_to> - make a move
+\tu - undo the last move
+\tp <depth> [-H <MB>] [-j <N>] [-c] - run Perft from current position up to a 
+\t\tspecified depth, optionally with a transposition table of given size
+\t\t(rounded down to a power of two buckets, used from depth 5 on)
+\t\tand/or split across N worker processes, or with copy-make (-c)
+\td <depth> [-j <N>] - run Perft, listing node counts for each move
+\tbb - probe the endgame bitbases (king and pawn against king)
+\tprof <depth> [-s] [-o <file>] - run Perft (or a search, -s) with hot path 
+\t\tmethods instrumented and print their call counts and times, or save 
+\t\tcProfile stats to a file
+\te <code> - execute Python code (debug purposes only)"""
+
+
+def interactive_mode(board: Board) -> None:
+    """Work with a board in an interactive command prompt mode."""
+
+    print("Interactive command prompt mode\nType 'h' for help, 'q' to quit")
+    active = True
+    while active:
+        cmd, *args = input().strip().split()
+        if cmd in ('q', 'qqq', 'quit', 'exit'):
+            active = False
+        elif cmd in ('h', 'help'):
+            print(HELP_STR)
+        elif cmd in ('b', 'board'):
+            print(board)
+        elif cmd in ('c', 'iic', 'check'):
+            print(board.is_in_check())
+
+        elif cmd in ('f', 'fen'):
+            if len(args) == 1 and args[0] == 'get':
+                print(board.get_fen())
+            else:
+                fen = ''
+                for arg in args:
+                    fen += arg + ' '
+                board.set_fen(fen)
+
+        elif cmd in ('l', 'slm', 'legal'):
+            if len(args) == 1:
+                board.show_legal_moves(board.alg_to_num(*args))
+            else:
+                move_list = MoveList()
+                board.generate_moves(move_list)
+                print(', '.join(moves_to_san(board, move_list)))
+
+        elif cmd in ('s', 'spp', 'pieces'):
+            board.show_piece_positions(*args)
+
+        elif cmd in ('m', 'mm', 'move'):
+            from_num = board.alg_to_num(args[0])
+            to_num = board.alg_to_num(args[1])
+            promote_to = 'q'
+            if len(args) > 2:
+                promote_to = args[2]
+            board.make_move(from_num, to_num, promote_to)
+
+        elif cmd in ('u', 'um', 'undo', 'umove', 'unmove'):
+            board.unmake_move()
+
+        elif cmd in ('e', 'exec'):
+            to_exec = ''
+            for arg in args:
+                to_exec += arg + ' '
+            exec(to_exec.rstrip())
+
+        elif cmd in ('p', 'perft'):
+            hash_mb = 0
+            if '-H' in args:
+                hash_mb = int(args[args.index('-H') + 1])
+            copy_make = '-c' in args
+            start_time = time()
+            if '-j' in args:
+                workers = int(args[args.index('-j') + 1])
+                nodes = board.perft_parallel(int(args[0]), workers, hash_mb, copy_make)
+            else:
+                nodes = board.perft(int(args[0]), hash_mb, copy_make)
+            total_time = round(time() - start_time, 2)
+            print(f'Nodes: {nodes} \tTime: {total_time} s \tSpeed: {int(nodes//(total_time*1000)) if total_time != 0 else "Inf"} knodes/s')
+            if hash_mb > 0:
+                if '-j' in args:
+                    print('Hash statistics are not available with -j (one table per worker)')
+                elif board._perft_table is None:
+                    print('Hash table not used (perft shallower than depth 5)')
+                else:
+                    print(board._perft_table.stats_str())
+
+        elif cmd in ('d', 'divide'):
+            start_time = time()
+            if '-j' in args:
+                workers = int(args[args.index('-j') + 1])
+                ans_dict = board.divide_parallel(int(args[0]), workers)
+            else:
+                ans_dict = board.divide(int(args[0]))
+            for move, count in ans_dict.items():
+                print(f'{move}: {count}')
+            print(f'\nNodes total: {sum(ans_dict.values())}')
+            print(f'Time: {round(time() - start_time, 2)} s')
+
+        elif cmd in ('bb', 'bitbase'):
+            outcome = board.probe_bitbase()
+            print({None: 'Not in the bitbases', 1: 'Won', 0: 'Drawn', -1: 'Lost'}[outcome]
+                  + (' for the side to move' if outcome else ''))
+
+        elif cmd in ('prof', 'profile'):
+            depth = int(args[0])
+            if '-s' in args:
+                from .search import Searcher
+                run = Searcher(board).search
+            else:
+                run = board.perft
+            if '-o' in args:
+                import cProfile
+                import pstats
+                stats_file = args[args.index('-o') + 1]
+                profiler = cProfile.Profile()
+                profiler.runcall(run, depth)
+                profiler.dump_stats(stats_file)
+                pstats.Stats(stats_file).sort_stats('cumulative').print_stats(15)
+            else:
+                from .profiling import (Instrumentation, INSTRUMENTED_METHODS, 
+                                        SEARCH_INSTRUMENTED_METHODS)
+                methods = SEARCH_INSTRUMENTED_METHODS if '-s' in args else INSTRUMENTED_METHODS
+                with Instrumentation(Board, methods) as instrumentation:
+                    start_time = time()
+                    result = run(depth)
+                    total_time = time() - start_time
+                nodes = result.nodes if '-s' in args else result
+                print(f'Nodes: {nodes} \tTime: {round(total_time, 2)} s (instrumented)')
+                print(instrumentation.report(nodes, total_time))
+        else:
+            print(f'Unknown command: {cmd}')
+
+
+def main() -> None:
+    """Command line entry point: print the logo and start the prompt."""
+
+    print(LOGO_STR)
+    interactive_mode(Board())
+
+
+if __name__ == '__main__':
+    main()
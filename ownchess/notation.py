@@ -0,0 +1,211 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+import re
+
+from .board import (Board, SQUARE_NAMES, SQUARE_NUMBERS, PROMOTION_PIECES,
+                    MOVE_QUIET, MOVE_CASTLING, MOVE_EN_PASSANT, MOVE_PROMOTION,
+                    EMPTY, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, WHITE, TYPE_MASK)
+
+
+# SAN move other than castling: piece, disambiguation, capture, target
+# square, promotion
+_SAN_RE = re.compile(r'([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQnbrq]))?')
+
+# SAN piece letters indexed by piece type, and the reverse mapping
+_SAN_PIECE_CHARS = ' PNBRQK'
+_SAN_PIECES = {'N': KNIGHT, 'B': BISHOP, 'R': ROOK, 'Q': QUEEN, 'K': KING}
+
+# SAN promotion suffixes indexed by the promotion field of packed moves
+_SAN_PROMOTIONS = ('=N', '=B', '=R', '=Q')
+
+
+def _pack_move(board: Board, from_num: int, to_num: int, promote_to: str = '') -> int:
+    """
+    Internal function. Pack a move of the board's position, setting the
+    castling, en passant and promotion flags from the moving piece.
+    """
+    piece_type = board._chessboard[from_num] & TYPE_MASK
+    if piece_type == PAWN:
+        if to_num // 8 in (0, 7):
+            return (from_num | to_num << 6 | MOVE_PROMOTION << 12 |
+                    PROMOTION_PIECES.index(promote_to or 'q') << 14)
+        if to_num == board._ep_square:
+            return from_num | to_num << 6 | MOVE_EN_PASSANT << 12
+    elif piece_type == KING and abs(to_num - from_num) == 2:
+        return from_num | to_num << 6 | MOVE_CASTLING << 12
+    return from_num | to_num << 6 | MOVE_QUIET << 12
+
+
+def move_to_uci(move: int) -> str:
+    """Return a packed move in UCI (coordinate) notation, e.g. 'e7e8q'."""
+
+    move_str = SQUARE_NAMES[move & 63] + SQUARE_NAMES[move >> 6 & 63]
+    if move >> 12 & 3 == MOVE_PROMOTION:
+        move_str += PROMOTION_PIECES[move >> 14]
+    return move_str
+
+
+def moves_to_uci(moves: Iterable[int]) -> str:
+    """Return packed moves (e.g. a PV) in UCI notation, separated by spaces."""
+
+    return ' '.join([move_to_uci(move) for move in moves])
+
+
+def uci_to_move(board: Board, move_str: str) -> int:
+    """
+    Convert a move in UCI notation to a packed move of the board's position.
+    Returns 0 if the string is malformed; legality is not checked.
+    """
+    from_num = SQUARE_NUMBERS.get(move_str[0:2], -1)
+    to_num = SQUARE_NUMBERS.get(move_str[2:4], -1)
+    promote_to = move_str[4:].lower()
+    if from_num == -1 or to_num == -1 or promote_to not in ('', *PROMOTION_PIECES):
+        return 0
+    return _pack_move(board, from_num, to_num, promote_to)
+
+
+def _move_origins(board: Board) -> Dict[Tuple[int, int], List[int]]:
+    """
+    Internal function. Map (piece code, target square) pairs to the
+    squares of pieces with a legal move there, for SAN disambiguation.
+    """
+    chessboard = board._chessboard
+    origins = {}
+    for from_num, to_num in board._all_legal_moves:
+        origins.setdefault((chessboard[from_num], to_num), []).append(from_num)
+    return origins
+
+
+def _move_to_san(board: Board, move: int,
+                 origins: Optional[Dict[Tuple[int, int], List[int]]] = None) -> str:
+    """
+    Internal function. See moves_to_san(). If no origins map is given, the
+    other pieces of the moving kind are tested for a legal move to the same
+    square instead, which is cheaper for a single move.
+    """
+
+    chessboard = board._chessboard
+    from_num, to_num, flags = move & 63, move >> 6 & 63, move >> 12 & 3
+    piece = chessboard[from_num]
+    piece_type = piece & TYPE_MASK
+
+    if flags == MOVE_CASTLING:
+        move_str = 'O-O' if to_num > from_num else 'O-O-O'
+    elif piece_type == PAWN:
+        if chessboard[to_num] != EMPTY or flags == MOVE_EN_PASSANT:
+            move_str = SQUARE_NAMES[from_num][0] + 'x' + SQUARE_NAMES[to_num]
+        else:
+            move_str = SQUARE_NAMES[to_num]
+        if flags == MOVE_PROMOTION:
+            move_str += _SAN_PROMOTIONS[move >> 14]
+    else:
+        # Disambiguate by file, else by rank, else by both
+        if origins is None:
+            others = [sq_num for sq_num in board._piece_lists[board._to_move >> 4]
+                      if sq_num != from_num and chessboard[sq_num] == piece and
+                      board._is_legal_move(sq_num, to_num)]
+        else:
+            others = [sq_num for sq_num in origins.get((piece, to_num), ()) 
+                      if sq_num != from_num]
+        if not others:
+            disambiguation = ''
+        elif all(sq_num % 8 != from_num % 8 for sq_num in others):
+            disambiguation = SQUARE_NAMES[from_num][0]
+        elif all(sq_num // 8 != from_num // 8 for sq_num in others):
+            disambiguation = SQUARE_NAMES[from_num][1]
+        else:
+            disambiguation = SQUARE_NAMES[from_num]
+        capture = 'x' if chessboard[to_num] != EMPTY else ''
+        move_str = _SAN_PIECE_CHARS[piece_type] + disambiguation + capture + SQUARE_NAMES[to_num]
+
+    # Check and checkmate suffixes
+    board.make_packed_move(move, True)
+    if board.is_in_check():
+        move_str += '+' if board.has_legal_moves() else '#'
+    board.unmake_move()
+    return move_str
+
+
+def moves_to_san(board: Board, moves: Iterable[int]) -> List[str]:
+    """
+    Return legal packed moves of the board's position in SAN, e.g. 'Nbd7',
+    'exd6', 'e8=Q+', 'O-O-O#'. The legal moves of the position are looked
+    at once for the disambiguation of all the moves.
+    """
+    origins = _move_origins(board)
+    return [_move_to_san(board, move, origins) for move in moves]
+
+
+def move_to_san(board: Board, move: int) -> str:
+    """Return a legal packed move of the board's position in SAN."""
+
+    return _move_to_san(board, move)
+
+
+def line_to_san(board: Board, moves: Iterable[int], numbered: bool = True) -> str:
+    """
+    Return a sequence of packed moves played from the board's position
+    (a PV or a whole game) in SAN, separated by spaces and preceded by
+    move numbers if numbered is set, e.g. '12... Nf6 13. Bg5'. The board
+    is left in its original position.
+    """
+    tokens = []
+    played = 0
+    for move in moves:
+        if numbered:
+            if board._to_move == WHITE:
+                tokens.append(f'{board._fullmove_counter}.')
+            elif played == 0:
+                tokens.append(f'{board._fullmove_counter}...')
+        tokens.append(_move_to_san(board, move))
+        board.make_packed_move(move, True)
+        played += 1
+    for _ in range(played):
+        board.unmake_move()
+    return ' '.join(tokens)
+
+
+def san_to_move(board: Board, san: str) -> int:
+    """
+    Find the legal move of the board's position matching a SAN string,
+    returning it packed. Check, mate and annotation suffixes are ignored,
+    castling may be written with zeros. Raises ValueError if the string
+    is malformed, or the move is illegal or ambiguous.
+    """
+    san = san.rstrip('+#!?')
+
+    if san in ('O-O', 'O-O-O', '0-0', '0-0-0'):
+        king_sq = board._king_squares[board._to_move >> 4]
+        to_num = king_sq + 2 if len(san) == 3 else king_sq - 2
+        if not board._is_legal_move(king_sq, to_num):
+            raise ValueError(f'Illegal move: {san}')
+        return king_sq | to_num << 6 | MOVE_CASTLING << 12
+
+    match = _SAN_RE.fullmatch(san)
+    if not match:
+        raise ValueError(f'Malformed move: {san}')
+    piece_str, file_str, rank_str, to_str, promotion_str = match.groups()
+    piece_type = _SAN_PIECES[piece_str] if piece_str else PAWN
+    to_num = SQUARE_NUMBERS[to_str]
+    from_col = ord(file_str) - 97 if file_str else -1
+    from_row = int(rank_str) - 1 if rank_str else -1
+
+    # Test only the pieces which could make the move, rather than
+    # generating every legal move of the position
+    chessboard = board._chessboard
+    candidates = [from_num for from_num in board._piece_lists[board._to_move >> 4]
+                  if chessboard[from_num] & TYPE_MASK == piece_type and
+                  from_col in (-1, from_num % 8) and
+                  from_row in (-1, from_num // 8) and
+                  board._is_legal_move(from_num, to_num)]
+    if not candidates:
+        raise ValueError(f'Illegal move: {san}')
+    if len(candidates) > 1:
+        raise ValueError(f'Ambiguous move: {san}')
+
+    if piece_type == PAWN and to_num // 8 in (0, 7):
+        if not promotion_str:
+            raise ValueError(f'Missing promotion piece: {san}')
+        return _pack_move(board, candidates[0], to_num, promotion_str.lower())
+    if promotion_str:
+        raise ValueError(f'Unexpected promotion: {san}')
+    return _pack_move(board, candidates[0], to_num)
@@ -0,0 +1,142 @@
+from typing import Iterator
+
+from .board import (Board, MoveList, MOVE_EN_PASSANT, MOVE_PROMOTION, EMPTY,
+                    PAWN, QUEEN, KING, BLACK, TYPE_MASK)
+
+
+# Move ordering stages, in the order the moves are tried
+STAGE_HASH_MOVE = 0
+STAGE_CAPTURES = 1 # and promotions to a queen
+STAGE_KILLERS = 2
+STAGE_QUIET = 3
+STAGE_NAMES = ('hash move', 'captures', 'killers', 'quiet')
+
+# Index of a queen in the promotion field of packed moves
+_QUEEN_PROMOTION = 3
+
+
+class MoveOrderer:
+    """
+    Orders legal moves for alpha-beta search: the hash move first, then
+    captures by MVV-LVA (most valuable victim, least valuable attacker),
+    then killer moves of the ply, then the other quiet moves by their
+    history heuristic score. The moves are split into captures and quiet
+    moves in one pass, and the captures sorted, before the first capture
+    is tried. Only the killer lookup and the quiet move sort are deferred,
+    so they are skipped after a beta cutoff by the hash move or a capture.
+    """
+
+    KILLERS_PER_PLY = 2
+
+    def __init__(self, max_ply: int) -> None:
+        """Create an orderer with empty killer and history tables."""
+
+        self._killers = [[0] * MoveOrderer.KILLERS_PER_PLY for _ in range(max_ply + 1)]
+        # History scores indexed by piece code and target square
+        self._history = [[0] * 64 for _ in range(BLACK | KING + 1)]
+
+        # Statistics
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.stage_cutoffs = [0] * len(STAGE_NAMES)
+
+    def clear(self) -> None:
+        """Empty the killer and history tables and reset the statistics."""
+
+        for killers in self._killers:
+            killers[:] = [0] * MoveOrderer.KILLERS_PER_PLY
+        for scores in self._history:
+            scores[:] = [0] * 64
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.stage_cutoffs = [0] * len(STAGE_NAMES)
+
+    def ordered_moves(self, board: Board, moves: MoveList, ply: int,
+                      hash_move: int = 0) -> Iterator[int]:
+        """
+        Generate the moves of the list (legal moves of the board's position)
+        in search order. The board must not be changed between steps,
+        other than by making and unmaking the generated move.
+        """
+        # Hash move, before looking at any other move
+        if hash_move and hash_move in moves:
+            yield hash_move
+
+        # Split captures from quiet moves, scoring captures by MVV-LVA
+        chessboard = board._chessboard
+        captures = []
+        quiet_moves = []
+        for move in moves:
+            if move == hash_move:
+                continue
+            victim = chessboard[move >> 6 & 63] & TYPE_MASK
+            if move >> 12 & 3 == MOVE_EN_PASSANT:
+                victim = PAWN
+            elif move >> 12 & 3 == MOVE_PROMOTION and move >> 14 == _QUEEN_PROMOTION:
+                victim += QUEEN
+            if victim:
+                attacker = chessboard[move & 63] & TYPE_MASK
+                captures.append((victim * 8 - attacker, move))
+            else:
+                quiet_moves.append(move)
+
+        captures.sort(reverse=True)
+        for _, move in captures:
+            yield move
+
+        # Killer moves of this ply still to be searched
+        quiet_set = set(quiet_moves)
+        killers = {move for move in self._killers[ply]
+                   if move != hash_move and move in quiet_set}
+        for move in self._killers[ply]:
+            if move in killers:
+                yield move
+
+        # Remaining quiet moves by history score
+        history = self._history
+        if killers:
+            quiet_moves = [move for move in quiet_moves if move not in killers]
+        quiet_moves.sort(key=lambda move: history[chessboard[move & 63]][move >> 6 & 63],
+                         reverse=True)
+        yield from quiet_moves
+
+    def record_cutoff(self, board: Board, move: int, ply: int, depth: int,
+                      move_number: int, hash_move: int = 0) -> None:
+        """
+        Update the killer and history tables after a move (the move_number-th
+        one searched, from 0) caused a beta cutoff at given ply and remaining
+        depth. The board must be in the position the move was made from.
+        """
+        chessboard = board._chessboard
+        self.cutoffs += 1
+        if move_number == 0:
+            self.first_move_cutoffs += 1
+
+        is_quiet = (chessboard[move >> 6 & 63] == EMPTY and
+                    move >> 12 & 3 != MOVE_EN_PASSANT and
+                    not (move >> 12 & 3 == MOVE_PROMOTION and move >> 14 == _QUEEN_PROMOTION))
+        killers = self._killers[ply]
+        if move == hash_move:
+            self.stage_cutoffs[STAGE_HASH_MOVE] += 1
+        elif not is_quiet:
+            self.stage_cutoffs[STAGE_CAPTURES] += 1
+        elif move in killers:
+            self.stage_cutoffs[STAGE_KILLERS] += 1
+        else:
+            self.stage_cutoffs[STAGE_QUIET] += 1
+
+        if is_quiet:
+            # Newest killer first, without duplicates
+            if killers[0] != move:
+                killers[1:] = killers[:-1]
+                killers[0] = move
+            self._history[chessboard[move & 63]][move >> 6 & 63] += depth * depth
+
+    def stats_str(self) -> str:
+        """Return a string summarising the beta cutoffs by ordering stage."""
+
+        first_rate = self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+        stages = ' \t'.join(f'{name}: {count}'
+                            for name, count in zip(STAGE_NAMES, self.stage_cutoffs))
+        return (f'Cutoffs: {self.cutoffs} (first move {round(100 * first_rate, 1)}%) '
+                f'\t{stages}')
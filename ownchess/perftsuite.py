@@ -0,0 +1,124 @@
+from typing import Dict, Iterator, List, Tuple
+from time import time
+import json
+import os
+import sys
+
+from .board import Board
+
+
+# Default suite: standard perft positions and move generation edge cases
+# (en passant, castling, promotions, discovered and double checks)
+DEFAULT_EPD = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perftsuite.epd')
+
+
+def read_epd(path: str) -> Iterator[Tuple[str, Dict[int, int]]]:
+    """
+    Read an EPD perft file line by line, generating tuples of a FEN string
+    and a dictionary mapping depths to expected node counts. Lines look like
+    '<FEN> ;D1 20 ;D2 400', empty lines and lines starting with '#' are
+    skipped.
+    """
+    with open(path) as epd_file:
+        for line in epd_file:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            fen, *fields = line.split(';')
+            expected = {}
+            for field in fields:
+                depth_str, count_str = field.split()
+                expected[int(depth_str.lstrip('Dd'))] = int(count_str)
+            yield fen.strip(), expected
+
+
+def run_suite(path: str, max_depth: int, hash_mb: int = 0,
+              verbose: bool = True, copy_make: bool = False) -> Dict:
+    """
+    Run perft on every position of an EPD file at every listed depth up to
+    max_depth, comparing the node counts with the expected ones. If
+    copy_make is set, perft takes moves back with Board.pop_state(). Returns
+    a report dictionary with the results of every run and totals; progress
+    is printed to stderr if verbose is set.
+    """
+    results = []
+    board = Board()
+    for fen, expected in read_epd(path):
+        board.set_fen(fen)
+        for depth, expected_nodes in sorted(expected.items()):
+            if depth > max_depth:
+                break
+            start_time = time()
+            nodes = board.perft(depth, hash_mb, copy_make)
+            seconds = time() - start_time
+            results.append({
+                'fen': fen,
+                'depth': depth,
+                'expected': expected_nodes,
+                'nodes': nodes,
+                'seconds': round(seconds, 4),
+                'knps': round(nodes / seconds / 1000, 1) if seconds else None,
+                'passed': nodes == expected_nodes,
+            })
+            if verbose:
+                status = 'ok' if nodes == expected_nodes else f'FAIL (expected {expected_nodes})'
+                print(f'{fen} \tdepth {depth} \tnodes {nodes} \t{round(seconds, 2)} s \t{status}',
+                      file=sys.stderr)
+
+    total_nodes = sum(result['nodes'] for result in results)
+    total_seconds = sum(result['seconds'] for result in results)
+    failed = [result for result in results if not result['passed']]
+    return {
+        'epd': path,
+        'max_depth': max_depth,
+        'hash_mb': hash_mb,
+        'copy_make': copy_make,
+        'results': results,
+        'runs': len(results),
+        'failed': len(failed),
+        'total_nodes': total_nodes,
+        'total_seconds': round(total_seconds, 4),
+        'knps': round(total_nodes / total_seconds / 1000, 1) if total_seconds else None,
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Command line entry point. Prints the JSON report to stdout (or writes
+    it to a file) and returns 1 if any node count does not match, else 0.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run an EPD perft regression suite.')
+    parser.add_argument('epd', nargs='?', default=DEFAULT_EPD,
+                        help='EPD file with expected node counts (default: perftsuite.epd)')
+    parser.add_argument('-d', '--depth', type=int, default=3,
+                        help='maximum depth to run (default: 3)')
+    parser.add_argument('-H', '--hash', type=int, default=0, metavar='MB',
+                        help='perft transposition table size in MB, used from depth 5 on '
+                             '(default: none)')
+    parser.add_argument('-c', '--copy-make', action='store_true',
+                        help='take moves back by restoring saved positions, not unmake_move()')
+    parser.add_argument('-o', '--output', help='write the JSON report to a file')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='do not print progress to stderr')
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.epd, args.depth, args.hash, not args.quiet,
+                       args.copy_make)
+    report_str = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(report_str + '\n')
+    else:
+        print(report_str)
+
+    if not args.quiet:
+        print(f"{report['runs'] - report['failed']}/{report['runs']} passed \t"
+              f"Nodes: {report['total_nodes']} \tTime: {report['total_seconds']} s \t"
+              f"Speed: {report['knps']} knodes/s", file=sys.stderr)
+    return 1 if report['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
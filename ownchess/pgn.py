@@ -0,0 +1,262 @@
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+from time import time
+import mmap
+import re
+import sys
+
+from .board import Board, PAWN, ROOK, KING, WHITE, BLACK, COLOUR_MASK
+from .notation import line_to_san, san_to_move
+
+
+# Tag pair, e.g. [White "Kasparov, Garry"]
+_TAG_RE = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+# Movetext tokens: comments, NAGs, variation brackets, results,
+# move numbers and anything else (SAN moves)
+_TOKEN_RE = re.compile(r'\{[^}]*\}|;[^\n]*|\$\d+|[()]|1-0|0-1|1/2-1/2|\*|\d+\.+|[^\s{}();$]+')
+_RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+
+
+class GameResult(NamedTuple):
+    """Outcome of replaying a single game."""
+
+    index: int # position of the game in the file, from 0
+    headers: Dict[str, str]
+    plies: int # number of moves replayed (before the error, if any)
+    final_fen: str
+    game_end: int # Board.detect_game_end() code of the final position
+    error: str # empty if the game replayed correctly
+
+
+def read_games(path: str) -> Iterator[Tuple[Dict[str, str], str]]:
+    """
+    Read a PGN file, generating tuples of the tag pairs (as a dictionary)
+    and the raw movetext of every game. The file is memory-mapped rather
+    than read line by line through Python file objects.
+    """
+    with open(path, 'rb') as pgn_file:
+        try:
+            data = mmap.mmap(pgn_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            return
+        with data:
+            headers = {}
+            movetext = []
+            # Set by the empty line closing a tag section
+            tags_done = False
+            for line in iter(data.readline, b''):
+                line = line.strip()
+                if line.startswith(b'['):
+                    # Tag pair after movetext, or after a closed tag section
+                    # (a game without movetext), starts the next game
+                    if movetext or tags_done:
+                        yield headers, ' '.join(movetext)
+                        headers, movetext = {}, []
+                        tags_done = False
+                    match = _TAG_RE.match(line.decode('utf-8', 'replace'))
+                    if match:
+                        headers[match.group(1)] = match.group(2).replace('\\"', '"')
+                elif not line:
+                    tags_done = bool(headers) and not movetext
+                elif not line.startswith(b'%'):
+                    line = line.decode('utf-8', 'replace')
+                    movetext.append(line)
+                    # Game termination marker, also ends games without tags
+                    if line.endswith(_RESULTS) and line.split()[-1] in _RESULTS:
+                        yield headers, ' '.join(movetext)
+                        headers, movetext = {}, []
+                        tags_done = False
+            if headers or movetext:
+                yield headers, ' '.join(movetext)
+
+
+def san_moves(movetext: str) -> List[str]:
+    """
+    Return the SAN moves of the main line of a movetext, skipping move
+    numbers, comments, NAGs, variations and the game result.
+    """
+    moves = []
+    depth = 0
+    for token in _TOKEN_RE.findall(movetext):
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+        elif depth > 0 or token[0] in '{;$' or token[0].isdigit() and token[-1] == '.':
+            continue
+        elif token not in _RESULTS:
+            moves.append(token)
+    return moves
+
+
+# Castling rights bits with the king and rook start squares they need
+_CASTLING_SQUARES = ((1, 'K', WHITE, 4, 7), (2, 'Q', WHITE, 4, 0),
+                     (4, 'k', BLACK, 60, 63), (8, 'q', BLACK, 60, 56))
+
+
+def _setup_error(board: Board) -> str:
+    """
+    Internal function. Return why the board's position cannot occur in
+    a game (a missing or extra king, a pawn on the first or eighth rank,
+    a castling right without the king and rook on their start squares,
+    or the side not to move in check), empty if it can.
+    """
+    chessboard = board._chessboard
+    for colour, name in ((WHITE, 'white'), (BLACK, 'black')):
+        kings = chessboard.count(colour | KING)
+        if kings != 1:
+            return f'{kings} {name} kings'
+    for sq_num in (*range(8), *range(56, 64)):
+        if chessboard[sq_num] in (WHITE | PAWN, BLACK | PAWN):
+            return 'pawn on the first or eighth rank'
+    for bit, letter, colour, king_sq, rook_sq in _CASTLING_SQUARES:
+        if (board._castling & bit and (chessboard[king_sq] != colour | KING
+                                       or chessboard[rook_sq] != colour | ROOK)):
+            return f'castling right {letter} without the king and rook'
+    board._to_move ^= COLOUR_MASK
+    in_check = board.is_in_check()
+    board._to_move ^= COLOUR_MASK
+    return 'side not to move in check' if in_check else ''
+
+
+def replay_game(board: Board, headers: Dict[str, str], movetext: str,
+                index: int = 0) -> GameResult:
+    """
+    Replay a game on the given board, which is reset to the initial
+    position (or the position of the FEN tag) first, so that a single
+    board can be reused for any number of games. Replaying stops at the
+    first move that cannot be parsed or is illegal. Games set up from 
+    an invalid or impossible FEN are not replayed.
+    """
+    plies = 0
+    error = ''
+    try:
+        board.set_fen(headers.get('FEN', ''))
+    except (ValueError, KeyError, IndexError):
+        error = f'Invalid FEN: {headers["FEN"]}'
+    else:
+        setup_error = _setup_error(board)
+        if setup_error:
+            error = f'Invalid FEN ({setup_error}): {headers["FEN"]}'
+    if error:
+        board.set_fen()
+    else:
+        for san in san_moves(movetext):
+            try:
+                move = san_to_move(board, san)
+            except ValueError as exc:
+                error = f'Ply {plies + 1}: {exc}'
+                break
+            # Legality was checked while parsing
+            board.make_packed_move(move, True)
+            plies += 1
+    return GameResult(index, headers, plies, board.get_fen(),
+                      board.detect_game_end(), error)
+
+
+def export_game(board: Board, moves: List[int], headers: Dict[str, str],
+                line_length: int = 79) -> str:
+    """
+    Return a game in PGN: the tag pairs followed by the packed moves played
+    from the board's position in SAN, wrapped to lines of given length.
+    The FEN (and SetUp) tags are added if the board is not in the initial
+    position, and the board is left in its position.
+    """
+    headers = dict(headers)
+    fen = board.get_fen()
+    if fen != Board.FEN_INIT:
+        headers['SetUp'] = '1'
+        headers['FEN'] = fen
+    result = headers.setdefault('Result', '*')
+    lines = []
+    for name, value in headers.items():
+        value = value.replace('"', '\\"')
+        lines.append(f'[{name} "{value}"]')
+    lines.append('')
+
+    line = ''
+    for token in line_to_san(board, moves).split() + [result]:
+        if line and len(line) + 1 + len(token) > line_length:
+            lines.append(line)
+            line = token
+        else:
+            line = f'{line} {token}' if line else token
+    lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+# Board reused by every game replayed in a worker process
+_worker_board = None
+
+
+def _replay_worker(task: Tuple[int, Dict[str, str], str]) -> GameResult:
+    """Replay a game in a worker process (see replay_games())."""
+
+    global _worker_board
+    if _worker_board is None:
+        _worker_board = Board()
+    index, headers, movetext = task
+    return replay_game(_worker_board, headers, movetext, index)
+
+
+def replay_games(path: str, workers: int = 1,
+                 chunk_size: int = 64) -> Iterator[GameResult]:
+    """
+    Replay every game of a PGN file, generating the results in file order.
+    With more than one worker, games are sent in chunks to a pool of
+    worker processes (all CPUs if workers is 0), each replaying them on
+    its own reused board.
+    """
+    tasks = ((index, headers, movetext)
+             for index, (headers, movetext) in enumerate(read_games(path)))
+    if workers == 1:
+        board = Board()
+        for index, headers, movetext in tasks:
+            yield replay_game(board, headers, movetext, index)
+        return
+
+    # Serial replays (the default, -j 1) never start a pool
+    from multiprocessing import Pool
+    with Pool(workers or None) as pool:
+        yield from pool.imap(_replay_worker, tasks, chunk_size)
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Command line entry point. Replays every game of a PGN file, printing
+    the games which failed (or every game if verbose) and a summary with
+    the throughput. Returns 1 if any game failed, else 0.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Replay and validate the games of a PGN file.')
+    parser.add_argument('pgn', help='PGN file')
+    parser.add_argument('-j', '--jobs', type=int, default=1, metavar='N',
+                        help='number of worker processes, 0 for all CPUs (default: 1)')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='print the result of every game, not only failed ones')
+    args = parser.parse_args(argv)
+
+    games = failed = plies = 0
+    start_time = time()
+    for result in replay_games(args.pgn, args.jobs):
+        games += 1
+        plies += result.plies
+        if result.error:
+            failed += 1
+        if result.error or args.verbose:
+            status = result.error or 'ok'
+            print(f'{result.index + 1} \t{result.headers.get("White", "?")} - '
+                  f'{result.headers.get("Black", "?")} \tplies {result.plies} '
+                  f'\t{result.final_fen} \t{status}')
+    total_time = time() - start_time
+
+    print(f'Games: {games} ({failed} failed) \tPlies: {plies} \t'
+          f'Time: {round(total_time, 2)} s \t'
+          f'Speed: {round(games / total_time, 1) if total_time else "Inf"} games/s',
+          file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
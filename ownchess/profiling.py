@@ -0,0 +1,111 @@
+from typing import Dict, Tuple
+from time import perf_counter
+
+
+# Board methods on the perft hot path, instrumented by default
+INSTRUMENTED_METHODS = ('generate_moves', '_get_check_info', '_get_legal_targets',
+                        'get_pseudolegal_moves', '_is_king_safe_after', 'is_in_check',
+                        '_count_child_moves', '_count_legal_moves', '_move_piece',
+                        '_unmove_piece', '_update_piece_lists', 'make_move',
+                        'unmake_move')
+
+# Board methods on the search hot path (see search.py)
+SEARCH_INSTRUMENTED_METHODS = ('generate_moves', 'generate_captures', '_get_check_info',
+                               '_get_legal_targets', 'get_pseudolegal_moves',
+                               'get_pseudolegal_captures', '_is_king_safe_after',
+                               'is_in_check', '_move_piece', '_unmove_piece',
+                               '_update_piece_lists', 'make_move', 'unmake_move',
+                               'evaluate')
+
+
+class Instrumentation:
+    """
+    Opt-in call counters and timers for methods of a class. While enabled,
+    the methods are replaced on the class by wrappers which count calls and
+    measure the cumulative time (callees included); disabling restores the
+    original methods, so there is no cost at all when not in use.
+    Can be used as a context manager.
+    """
+
+    def __init__(self, cls: type, methods: Tuple[str, ...] = INSTRUMENTED_METHODS) -> None:
+        """Prepare instrumentation of given methods of a class (not enabled)."""
+
+        self._cls = cls
+        self._methods = methods
+        self._originals = {}
+        self.calls = dict.fromkeys(methods, 0)
+        self.times = dict.fromkeys(methods, 0.0)
+
+    def __enter__(self) -> 'Instrumentation':
+        """Enable the instrumentation."""
+
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Disable the instrumentation."""
+
+        self.disable()
+
+    def enable(self) -> None:
+        """Replace the methods by counting and timing wrappers."""
+
+        if self._originals:
+            return
+        for name in self._methods:
+            original = self._cls.__dict__[name]
+            self._originals[name] = original
+            setattr(self._cls, name, self._wrap(name, original))
+
+    def disable(self) -> None:
+        """Restore the original methods."""
+
+        for name, original in self._originals.items():
+            setattr(self._cls, name, original)
+        self._originals = {}
+
+    def reset(self) -> None:
+        """Set all counters and timers to zero."""
+
+        self.calls = dict.fromkeys(self._methods, 0)
+        self.times = dict.fromkeys(self._methods, 0.0)
+
+    def _wrap(self, name: str, func):
+        """Internal method. Return a wrapper of func updating the counters."""
+
+        def wrapper(*args, **kwargs):
+            start_time = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.times[name] += perf_counter() - start_time
+                self.calls[name] += 1
+
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+
+    def report(self, nodes: int = 0, total_time: float = 0.0) -> str:
+        """
+        Return a table of calls, cumulative and per call time of every
+        method. If the number of (leaf) nodes is given, calls per node are
+        listed as well, e.g. make/unmake pairs per node.
+        """
+        lines = [f'{"Method":<24}{"Calls":>12}{"Time (s)":>12}{"Per call (us)":>15}'
+                 + (f'{"% of total":>12}' if total_time else '')
+                 + (f'{"Per node":>10}' if nodes else '')]
+        for name in self._methods:
+            calls, seconds = self.calls[name], self.times[name]
+            line = (f'{name:<24}{calls:>12}{round(seconds, 3):>12}'
+                    f'{round(1e6 * seconds / calls, 2) if calls else 0:>15}')
+            if total_time:
+                line += f'{round(100 * seconds / total_time, 1):>12}'
+            if nodes:
+                line += f'{round(calls / nodes, 3):>10}'
+            lines.append(line)
+        return '\n'.join(lines)
+
+    def stats(self) -> Dict[str, Tuple[int, float]]:
+        """Return a dictionary mapping method names to (calls, seconds)."""
+
+        return {name: (self.calls[name], self.times[name]) for name in self._methods}
@@ -0,0 +1,405 @@
+from typing import Callable, List, NamedTuple, Tuple
+from time import time
+
+from .board import (Board, MoveList, decode_move, MOVE_EN_PASSANT, MOVE_PROMOTION,
+                    PAWN, KNIGHT, TYPE_MASK, MATERIAL_MG)
+from .notation import move_to_uci
+from .ordering import MoveOrderer
+
+
+# Search score bounds; mate scores are MATE_SCORE minus the distance
+# to mate in plies
+INF = 1_000_000
+MATE_SCORE = 100_000
+MAX_PLY = 64
+
+# Kinds of scores stored in the transposition table
+BOUND_EXACT = 0
+BOUND_LOWER = 1 # score failed high, true score is at least this
+BOUND_UPPER = 2 # score failed low, true score is at most this
+
+# Margin added to the material won by a capture in quiescence search before
+# it is pruned as unable to raise alpha (delta pruning)
+DELTA_MARGIN = 200
+
+
+class SearchResult(NamedTuple):
+    """Result of a search: best move, its score and the search statistics."""
+
+    best_move: int # packed (see board.encode_move()), 0 if no legal moves
+    score: int # centipawns from the point of view of the side to move
+    pv: List[int] # principal variation as packed moves
+    depth: int # last fully searched depth
+    nodes: int
+    time: float # seconds
+    nps: int # nodes per second
+
+
+class SearchTable:
+    """
+    Fixed-size, always-replace transposition table mapping hash keys
+    to the depth, score, bound type and best move found by the search.
+    """
+
+    # Approximate memory cost of a single entry (see board.PerftTable)
+    ENTRY_SIZE = 128
+
+    def __init__(self, hash_mb: int) -> None:
+        """Create an empty table using up to roughly hash_mb megabytes."""
+
+        entries = max(1, hash_mb * 2**20 // SearchTable.ENTRY_SIZE)
+        # Number of entries is a power of two, so that indexing is a bitmask
+        self._mask = (1 << (entries.bit_length() - 1)) - 1
+        size = self._mask + 1
+        self._keys = [-1] * size
+        self._depths = [0] * size
+        self._scores = [0] * size
+        self._bounds = [BOUND_EXACT] * size
+        self._moves = [0] * size
+
+        # Statistics
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key: int) -> Tuple[int, int, int, int]:
+        """
+        Return a tuple of the stored depth, score, bound type and best move
+        for a position, None if not found. Mate scores are relative to the
+        stored position (see Searcher._score_to_table()).
+        """
+        self.probes += 1
+        index = key & self._mask
+        if self._keys[index] != key:
+            return None
+        self.hits += 1
+        return (self._depths[index], self._scores[index], self._bounds[index],
+                self._moves[index])
+
+    def store(self, key: int, depth: int, score: int, bound: int, move: int) -> None:
+        """Store the search result for a position, replacing the old entry."""
+
+        index = key & self._mask
+        self._keys[index] = key
+        self._depths[index] = depth
+        self._scores[index] = score
+        self._bounds[index] = bound
+        self._moves[index] = move
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+
+        self._keys = [-1] * (self._mask + 1)
+        self.probes = 0
+        self.hits = 0
+
+    def hit_rate(self) -> float:
+        """Return the fraction of probes which found a stored result."""
+
+        return self.hits / self.probes if self.probes else 0.0
+
+
+class Searcher:
+    """
+    Negamax alpha-beta search with iterative deepening, running on a Board
+    object. Moves are made with make_move() in perft mode and unmade after
+    (or, in copy-make mode, taken back with Board.pop_state()), so the
+    board is left in its original position. Moves are tried in the
+    order given by a MoveOrderer, starting with the best move stored in
+    the transposition table.
+    """
+
+    # Depth searched if neither depth nor time limit is given
+    DEFAULT_DEPTH = 4
+    # Number of nodes between checks of the time limit (minus one, bitmask)
+    TIME_CHECK_MASK = 255
+
+    def __init__(self, board: Board, hash_mb: int = 16, ordering: bool = True,
+                 copy_make: bool = False) -> None:
+        """
+        Create a searcher working on given board, with a transposition table
+        of given size. Move ordering of the main search can be turned off 
+        (captures in quiescence search stay ordered), and copy-make turned
+        on, for comparison.
+        """
+        self._board = board
+        self._copy_make = copy_make
+        # Move lists reused at every ply, and the triangular PV table
+        self._move_lists = [MoveList() for _ in range(MAX_PLY + 1)]
+        self._pv_table = [[] for _ in range(MAX_PLY + 1)]
+        self._table = SearchTable(hash_mb)
+        self._orderer = MoveOrderer(MAX_PLY) if ordering else None
+        # Quiescence search always tries captures by MVV-LVA, without which
+        # it grows too large for the unordered search to be a usable baseline
+        # (this orderer records no cutoffs, so it has no killers or history)
+        self._quiescence_orderer = self._orderer or MoveOrderer(MAX_PLY)
+        self._nodes = 0
+        self._deadline = None
+        self._stopped = False
+        # Limits are only checked once depth 1 is complete
+        self._limits_active = False
+        self._stop_requested = False
+
+    def search(self, depth: int = None, movetime_ms: int = None,
+               on_iteration: Callable[[SearchResult], None] = None) -> SearchResult:
+        """
+        Search the current position up to given depth and/or for at most
+        movetime_ms milliseconds, or until stop() is called. Deepens one ply 
+        at a time, calling on_iteration (if given) with the result of every 
+        completed depth. An iteration interrupted by the time limit or stop()
+        is discarded, except for depth 1, which is always completed.
+        """
+        if depth is None:
+            depth = Searcher.DEFAULT_DEPTH if movetime_ms is None else MAX_PLY
+        depth = max(1, min(depth, MAX_PLY))
+
+        start_time = time()
+        self._deadline = None if movetime_ms is None else start_time + movetime_ms / 1000
+        self._nodes = 0
+        self._stopped = False
+        self._limits_active = False
+        self._stop_requested = False
+        if self._orderer is not None:
+            self._orderer.clear()
+        best_move, best_score, pv, completed_depth = 0, 0, [], 0
+
+        for iter_depth in range(1, depth + 1):
+            score = self._negamax(iter_depth, -INF, INF, 0)
+            if self._stopped:
+                break
+            pv = self._pv_table[0].copy()
+            best_move = pv[0] if pv else 0
+            best_score = score
+            completed_depth = iter_depth
+            if on_iteration is not None:
+                on_iteration(self._result(best_move, best_score, pv, completed_depth,
+                                          start_time))
+            # No need to search deeper once a forced mate is found
+            if abs(score) >= MATE_SCORE - MAX_PLY:
+                break
+            if self._stop_requested or (self._deadline is not None and 
+                                        time() >= self._deadline):
+                break
+            self._limits_active = True
+
+        return self._result(best_move, best_score, pv, completed_depth, start_time)
+
+    def stop(self) -> None:
+        """
+        Make a running search (in another thread) return as soon as possible
+        with the result of the last completed depth. Has no effect on
+        searches started later.
+        """
+        self._stop_requested = True
+
+    def _result(self, best_move: int, score: int, pv: List[int], depth: int, 
+                start_time: float) -> SearchResult:
+        """Internal method. Return a SearchResult with current statistics."""
+
+        total_time = time() - start_time
+        return SearchResult(best_move, score, pv, depth, self._nodes, total_time,
+                            int(self._nodes / total_time) if total_time else 0)
+
+    def _negamax(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """
+        Internal method. Return the score of the position from the point of
+        view of the side to move, searching depth plies with an alpha-beta
+        window. The principal variation is stored in self._pv_table[ply].
+        """
+        self._nodes += 1
+        if self._limits_active and not self._nodes & Searcher.TIME_CHECK_MASK:
+            self._check_limits()
+        if self._stopped:
+            return 0
+
+        board = self._board
+        pv_line = self._pv_table[ply]
+        pv_line.clear()
+        if depth == 0 or ply == MAX_PLY:
+            return self._quiescence(alpha, beta, ply)
+
+        # Draws by repetition (a single one is enough, as the side to move 
+        # could repeat it again), fifty-move rule or insufficient material
+        if ply > 0 and board.is_draw(2):
+            return 0
+
+        # Endgames known to be drawn. Won ones are still searched, so that
+        # the evaluation leads the way to promoting the pawn
+        if ply > 0 and board.probe_bitbase() == 0:
+            return 0
+
+        # Transposition table cutoffs (not at the root, which needs a move)
+        zb_key = board.zobrist_key()
+        hash_move = 0
+        entry = self._table.probe(zb_key)
+        if entry is not None:
+            tt_depth, tt_score, tt_bound, hash_move = entry
+            if ply > 0 and tt_depth >= depth:
+                tt_score = self._score_from_table(tt_score, ply)
+                if (tt_bound == BOUND_EXACT or
+                    (tt_bound == BOUND_LOWER and tt_score >= beta) or
+                    (tt_bound == BOUND_UPPER and tt_score <= alpha)):
+                    if hash_move:
+                        pv_line.append(hash_move)
+                    return tt_score
+
+        moves = self._move_lists[ply]
+        board.generate_moves(moves)
+        # Checkmate or stalemate
+        if len(moves) == 0:
+            return -MATE_SCORE + ply if board.is_in_check() else 0
+
+        orderer = self._orderer
+        ordered = (moves if orderer is None else
+                   orderer.ordered_moves(board, moves, ply, hash_move))
+        alpha_orig = alpha
+        best_score, best_move = -INF, 0
+        copy_make = self._copy_make
+        for move_number, move in enumerate(ordered):
+            if copy_make:
+                board.push_state()
+                board.make_move_unrecorded(move)
+                score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+                board.pop_state()
+            else:
+                board.make_move(*decode_move(move), True)
+                score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+                board.unmake_move()
+            if self._stopped:
+                return 0
+
+            if score > best_score:
+                best_score, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    pv_line[:] = [move] + self._pv_table[ply + 1]
+                    if alpha >= beta:
+                        if orderer is not None:
+                            orderer.record_cutoff(board, move, ply, depth, move_number,
+                                                  hash_move)
+                        break
+
+        if best_score >= beta:
+            bound = BOUND_LOWER
+        elif best_score > alpha_orig:
+            bound = BOUND_EXACT
+        else:
+            bound = BOUND_UPPER
+        self._table.store(zb_key, depth, self._score_to_table(best_score, ply), bound,
+                          best_move)
+        return best_score
+
+    def _quiescence(self, alpha: int, beta: int, ply: int) -> int:
+        """
+        Internal method. Return the score of the position searching only 
+        captures and promotions, so that leaf positions are evaluated when 
+        quiet. The side to move can stand pat on the static evaluation, 
+        captures which cannot raise it above alpha even with a margin are 
+        skipped (delta pruning). When in check, all moves are searched.
+        """
+        self._nodes += 1
+        if self._limits_active and not self._nodes & Searcher.TIME_CHECK_MASK:
+            self._check_limits()
+        if self._stopped:
+            return 0
+
+        board = self._board
+        if ply == MAX_PLY:
+            return self.evaluate()
+        moves = self._move_lists[ply]
+        in_check = board.is_in_check()
+        if in_check:
+            board.generate_moves(moves)
+            # Checkmate
+            if len(moves) == 0:
+                return -MATE_SCORE + ply
+            best_score = -INF
+        else:
+            # Stand pat
+            best_score = self.evaluate()
+            if best_score >= beta:
+                return best_score
+            alpha = max(alpha, best_score)
+            board.generate_captures(moves)
+
+        chessboard = board._chessboard
+        ordered = self._quiescence_orderer.ordered_moves(board, moves, ply)
+        for move in ordered:
+            # Delta pruning
+            if not in_check:
+                gain = MATERIAL_MG[chessboard[move >> 6 & 63] & TYPE_MASK]
+                if move >> 12 & 3 == MOVE_EN_PASSANT:
+                    gain = MATERIAL_MG[PAWN]
+                elif move >> 12 & 3 == MOVE_PROMOTION:
+                    gain += MATERIAL_MG[KNIGHT + (move >> 14)] - MATERIAL_MG[PAWN]
+                if best_score + gain + DELTA_MARGIN <= alpha:
+                    continue
+
+            if self._copy_make:
+                board.push_state()
+                board.make_move_unrecorded(move)
+                score = -self._quiescence(-beta, -alpha, ply + 1)
+                board.pop_state()
+            else:
+                board.make_move(*decode_move(move), True)
+                score = -self._quiescence(-beta, -alpha, ply + 1)
+                board.unmake_move()
+            if self._stopped:
+                return 0
+
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        return best_score
+
+    def _check_limits(self) -> None:
+        """Internal method. Stop the search if out of time or asked to stop."""
+
+        if self._stop_requested or (self._deadline is not None and 
+                                    time() >= self._deadline):
+            self._stopped = True
+
+    def _score_to_table(self, score: int, ply: int) -> int:
+        """
+        Internal method. Convert a mate score relative to the root into one
+        relative to the position at given ply, for storing in the table.
+        """
+        if score >= MATE_SCORE - MAX_PLY:
+            return score + ply
+        if score <= -MATE_SCORE + MAX_PLY:
+            return score - ply
+        return score
+
+    def _score_from_table(self, score: int, ply: int) -> int:
+        """Internal method. Reverse of _score_to_table()."""
+
+        if score >= MATE_SCORE - MAX_PLY:
+            return score - ply
+        if score <= -MATE_SCORE + MAX_PLY:
+            return score + ply
+        return score
+
+    def evaluate(self) -> int:
+        """
+        Return the static evaluation of the position from the point of view
+        of the side to move (see Board.evaluate()).
+        """
+        return self._board.evaluate()
+
+    def stats_str(self) -> str:
+        """Return a string summarising the hash table and move ordering usage."""
+
+        table = self._table
+        s = (f'Hash probes: {table.probes} \tHits: {table.hits} '
+             f'({round(100 * table.hit_rate(), 1)}%)')
+        if self._orderer is not None:
+            s += '\n' + self._orderer.stats_str()
+        return s
+
+    def move_to_str(self, move: int) -> str:
+        """Return a packed move in coordinate notation, e.g. 'e7e8q'."""
+
+        return move_to_uci(move)
@@ -0,0 +1,225 @@
+from typing import List, TextIO
+from threading import Lock, Thread, Event
+import sys
+
+from .board import Board, WHITE
+from .notation import move_to_uci, moves_to_uci, uci_to_move
+from .polyglot import PolyglotBook, book_move_to_uci
+from .search import Searcher, SearchResult, MATE_SCORE, MAX_PLY
+
+
+class UciEngine:
+    """
+    Universal Chess Interface front end. Commands are read from stdin in the
+    main thread, while searches run in a worker thread, so that commands
+    like stop and isready are answered during a search.
+    """
+
+    NAME = 'ownchess'
+    AUTHOR = 'sgfn'
+
+    # Transposition table size option (MB)
+    HASH_DEFAULT = 16
+    HASH_MIN = 1
+    HASH_MAX = 1024
+
+    # Time management: use 1/MOVES_TO_GO of the remaining time (plus half
+    # of the increment), keeping a safety margin for communication
+    MOVES_TO_GO = 30
+    TIME_MARGIN_MS = 50
+
+    def __init__(self, output: TextIO = sys.stdout) -> None:
+        """Create an engine set up in the initial position."""
+
+        self._output = output
+        self._output_lock = Lock()
+        self._board = Board()
+        self._hash_mb = UciEngine.HASH_DEFAULT
+        self._searcher = Searcher(self._board, self._hash_mb)
+        self._search_thread = None
+        self._book = None
+        # Set when an infinite search may report its best move
+        self._infinite_done = Event()
+
+    def run(self, input_stream: TextIO = sys.stdin) -> None:
+        """Process commands until 'quit' or the end of input."""
+
+        for line in input_stream:
+            if not self.handle(line):
+                break
+        self._stop_search()
+
+    def handle(self, line: str) -> bool:
+        """Process a single command line. Returns False after 'quit'."""
+
+        cmd, *args = line.strip().split() or ['']
+        if cmd == 'uci':
+            self._send(f'id name {UciEngine.NAME}')
+            self._send(f'id author {UciEngine.AUTHOR}')
+            self._send(f'option name Hash type spin default {UciEngine.HASH_DEFAULT} '
+                       f'min {UciEngine.HASH_MIN} max {UciEngine.HASH_MAX}')
+            self._send('option name BookFile type string default <empty>')
+            self._send('uciok')
+        elif cmd == 'isready':
+            self._send('readyok')
+        elif cmd == 'setoption':
+            self._set_option(args)
+        elif cmd == 'ucinewgame':
+            self._stop_search()
+            self._board.set_fen()
+            self._searcher = Searcher(self._board, self._hash_mb)
+        elif cmd == 'position':
+            self._stop_search()
+            self._set_position(args)
+        elif cmd == 'go':
+            self._stop_search()
+            self._go(args)
+        elif cmd == 'stop':
+            self._stop_search()
+        elif cmd == 'quit':
+            return False
+        elif cmd != '':
+            self._send(f'info string Unknown command: {cmd}')
+        return True
+
+    def _send(self, message: str) -> None:
+        """Internal method. Write a line to the output (thread-safe)."""
+
+        with self._output_lock:
+            self._output.write(message + '\n')
+            self._output.flush()
+
+    def _set_option(self, args: List[str]) -> None:
+        """Internal method. Handle 'setoption name <id> [value <x>]'."""
+
+        if 'name' not in args:
+            return
+        value_index = args.index('value') if 'value' in args else len(args)
+        name = ' '.join(args[args.index('name') + 1:value_index])
+        value = ' '.join(args[value_index + 1:])
+        if name.lower() == 'hash':
+            try:
+                hash_mb = int(value)
+            except ValueError:
+                self._send(f'info string Invalid value for Hash: {value}')
+                return
+            self._stop_search()
+            self._hash_mb = max(UciEngine.HASH_MIN, min(hash_mb, UciEngine.HASH_MAX))
+            self._searcher = Searcher(self._board, self._hash_mb)
+        elif name.lower() == 'bookfile':
+            if self._book is not None:
+                self._book.close()
+                self._book = None
+            if value and value != '<empty>':
+                try:
+                    self._book = PolyglotBook(value)
+                except OSError:
+                    self._send(f'info string Cannot open book: {value}')
+        else:
+            self._send(f'info string Unknown option: {name}')
+
+    def _set_position(self, args: List[str]) -> None:
+        """Internal method. Handle 'position [startpos | fen <FEN>] [moves ...]'."""
+
+        moves_index = args.index('moves') if 'moves' in args else len(args)
+        if args and args[0] == 'fen':
+            fen = ' '.join(args[1:moves_index])
+            try:
+                self._board.set_fen(fen)
+            except (ValueError, KeyError, IndexError):
+                self._send(f'info string Invalid FEN: {fen}')
+                self._board.set_fen()
+                return
+        else:
+            self._board.set_fen()
+
+        board = self._board
+        for move_str in args[moves_index + 1:]:
+            move = uci_to_move(board, move_str)
+            if not move or not board._is_legal_move(move & 63, move >> 6 & 63):
+                self._send(f'info string Illegal move: {move_str}')
+                return
+            board.make_packed_move(move, True)
+
+    def _go(self, args: List[str]) -> None:
+        """
+        Internal method. Handle 'go' with depth, movetime, wtime/btime
+        (winc/binc, movestogo) or infinite limits, starting the search
+        in a worker thread. Searches without limits are infinite.
+        """
+        params = {}
+        for index, arg in enumerate(args[:-1]):
+            if arg in ('depth', 'movetime', 'wtime', 'btime', 'winc', 'binc', 'movestogo'):
+                try:
+                    params[arg] = int(args[index + 1])
+                except ValueError:
+                    self._send(f'info string Invalid value for {arg}: {args[index + 1]}')
+
+        depth = params.get('depth')
+        movetime_ms = params.get('movetime')
+        white = self._board._to_move == WHITE
+        time_left = params.get('wtime' if white else 'btime')
+        if time_left is not None and movetime_ms is None:
+            increment = params.get('winc' if white else 'binc', 0)
+            moves_to_go = params.get('movestogo', UciEngine.MOVES_TO_GO)
+            movetime_ms = min(time_left // max(1, moves_to_go) + increment // 2,
+                              time_left - UciEngine.TIME_MARGIN_MS)
+            movetime_ms = max(1, movetime_ms)
+
+        infinite = 'infinite' in args or (depth is None and movetime_ms is None)
+        # Play book moves without searching (except for analysis)
+        if self._book is not None and not infinite:
+            book_move = self._book.choose_move(self._board)
+            if book_move is not None:
+                self._send(f'bestmove {book_move_to_uci(self._board, book_move)}')
+                return
+
+        if infinite:
+            depth = MAX_PLY
+            self._infinite_done.clear()
+        else:
+            self._infinite_done.set()
+
+        self._search_thread = Thread(target=self._search, args=(depth, movetime_ms),
+                                     daemon=True)
+        self._search_thread.start()
+
+    def _search(self, depth: int, movetime_ms: int) -> None:
+        """Internal method. Worker thread body: search and report the best move."""
+
+        result = self._searcher.search(depth, movetime_ms, self._send_info)
+        # Infinite searches report the best move only after 'stop'
+        self._infinite_done.wait()
+        if result.best_move:
+            self._send(f'bestmove {move_to_uci(result.best_move)}')
+        else:
+            self._send('bestmove 0000')
+
+    def _stop_search(self) -> None:
+        """Internal method. Stop the running search and wait for its result."""
+
+        thread = self._search_thread
+        if thread is None:
+            return
+        self._infinite_done.set()
+        # Repeated in case the search has not started yet
+        while thread.is_alive():
+            self._searcher.stop()
+            thread.join(0.01)
+        self._search_thread = None
+
+    def _send_info(self, result: SearchResult) -> None:
+        """Internal method. Report a completed search iteration."""
+
+        if abs(result.score) >= MATE_SCORE - MAX_PLY:
+            plies = MATE_SCORE - abs(result.score)
+            score = f'mate {(plies + 1) // 2 if result.score > 0 else -(plies // 2)}'
+        else:
+            score = f'cp {result.score}'
+        self._send(f'info depth {result.depth} score {score} nodes {result.nodes} '
+                   f'nps {result.nps} time {int(result.time * 1000)} '
+                   f'pv {moves_to_uci(result.pv)}')
+
+
+if __name__ == '__main__':
+    UciEngine().run()
@@ -0,0 +1,57 @@
+import unittest
+
+from ownchess.board import Board
+from ownchess.bitbase import generate_kpk, KPK_PATH, KPK_POSITIONS
+
+
+class KpkBitbaseTest(unittest.TestCase):
+    """The committed KPK bitbase and probing through Board.probe_bitbase()."""
+
+    def probe(self, fen: str) -> int:
+        """Return the bitbase result of a position."""
+
+        return Board(fen).probe_bitbase()
+
+    def test_committed_file_matches_generator(self) -> None:
+        with open(KPK_PATH, 'rb') as kpk_file:
+            committed = kpk_file.read()
+        self.assertEqual(len(committed), KPK_POSITIONS // 8)
+        self.assertEqual(generate_kpk(), committed)
+
+    def test_known_positions(self) -> None:
+        # King on the sixth rank in front of the pawn wins either way
+        self.assertEqual(self.probe('4k3/8/4K3/4P3/8/8/8/8 w - - 0 1'), 1)
+        self.assertEqual(self.probe('4k3/8/4K3/4P3/8/8/8/8 b - - 0 1'), -1)
+        # Further back, only with the opposition
+        self.assertEqual(self.probe('8/4k3/8/4K3/4P3/8/8/8 w - - 0 1'), 0)
+        self.assertEqual(self.probe('8/4k3/8/4K3/4P3/8/8/8 b - - 0 1'), -1)
+        # Rook pawn with the defending king in the corner
+        self.assertEqual(self.probe('k7/8/K7/P7/8/8/8/8 w - - 0 1'), 0)
+        # Pawn out of reach of the defending king
+        self.assertEqual(self.probe('8/8/8/P7/8/8/7k/K7 w - - 0 1'), 1)
+        # Defending king catches the pawn
+        self.assertEqual(self.probe('8/8/8/8/k7/8/P7/7K b - - 0 1'), 0)
+
+    def test_symmetry(self) -> None:
+        """Mirrored and colour-flipped positions have the same result."""
+
+        fens = ('8/8/4k3/8/3KP3/8/8/8 w - - 0 1', '8/8/4k3/8/3KP3/8/8/8 b - - 0 1',
+                '8/8/8/2k5/8/1P6/1K6/8 w - - 0 1', '8/8/8/2k5/8/1P6/1K6/8 b - - 0 1')
+        for fen in fens:
+            rows, side, *rest = fen.split()
+            mirrored = '/'.join(row[::-1] for row in rows.split('/'))
+            flipped = '/'.join(rows.split('/')[::-1]).swapcase()
+            other_side = 'b' if side == 'w' else 'w'
+            with self.subTest(fen=fen):
+                result = self.probe(fen)
+                self.assertIsNotNone(result)
+                self.assertEqual(self.probe(f'{mirrored} {side} - - 0 1'), result)
+                self.assertEqual(self.probe(f'{flipped} {other_side} - - 0 1'), result)
+
+    def test_not_covered(self) -> None:
+        self.assertIsNone(self.probe(Board.FEN_INIT))
+        self.assertIsNone(self.probe('4k3/8/8/8/8/8/4N3/4K3 w - - 0 1'))
+
+
+if __name__ == '__main__':
+    unittest.main()
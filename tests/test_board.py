@@ -0,0 +1,260 @@
+import pickle
+import random
+import unittest
+
+from ownchess.board import Board, MoveList, EMPTY, PAWN, TYPE_MASK
+from ownchess.perftsuite import read_epd, DEFAULT_EPD
+
+
+def random_walk(board: Board, rng: random.Random, plies: int):
+    """
+    Make up to the given number of random legal moves, generating the FEN
+    of the position before each move once it is made (the walk stops early
+    at the end of the game).
+    """
+    moves = MoveList()
+    for _ in range(plies):
+        if not board.generate_moves(moves):
+            return
+        fen = board.get_fen()
+        board.make_packed_move(moves[rng.randrange(len(moves))], True)
+        yield fen
+
+
+class IncrementalStateTest(unittest.TestCase):
+    """State kept up to date by make/unmake against full recomputes."""
+
+    def assert_consistent(self, board: Board) -> None:
+        """Check the incremental state of a board against a recompute."""
+
+        self.assertEqual(board.zobrist_key(), board._compute_zobrist_key())
+        self.assertEqual(board.zobrist_key(), Board(board.get_fen()).zobrist_key())
+        self.assertEqual((board._eval_mg, board._eval_eg, board._phase), board._compute_eval())
+
+    def test_random_games(self) -> None:
+        rng = random.Random(2024)
+        for fen, _ in read_epd(DEFAULT_EPD):
+            board = Board(fen)
+            fens = []
+            for previous_fen in random_walk(board, rng, 40):
+                fens.append(previous_fen)
+                self.assert_consistent(board)
+            for expected_fen in reversed(fens):
+                board.unmake_move()
+                self.assertEqual(board.get_fen(), expected_fen)
+                self.assert_consistent(board)
+
+    def test_evaluation_symmetry(self) -> None:
+        """A colour-flipped position has the same score for the side to move."""
+
+        for fen, _ in read_epd(DEFAULT_EPD):
+            rows, side, castling, *_ = fen.split()
+            flipped = '/'.join(rows.split('/')[::-1]).swapcase()
+            flipped_castling = castling.swapcase() if castling != '-' else '-'
+            other_side = 'b' if side == 'w' else 'w'
+            with self.subTest(fen=fen):
+                self.assertEqual(Board(f'{flipped} {other_side} {flipped_castling} - 0 1').evaluate(),
+                                 Board(fen).evaluate())
+
+    def test_transposition_keys(self) -> None:
+        """Move orders reaching the same position give the same key."""
+
+        keys = []
+        for line in (('g1f3', 'g8f6', 'b1c3'), ('b1c3', 'g8f6', 'g1f3')):
+            board = Board()
+            for move_str in line:
+                board.make_move(board.alg_to_num(move_str[:2]), board.alg_to_num(move_str[2:]))
+            keys.append(board.zobrist_key())
+        self.assertEqual(keys[0], keys[1])
+        self.assertNotEqual(keys[0], Board().zobrist_key())
+
+    def test_copy_make(self) -> None:
+        rng = random.Random(7)
+        moves = MoveList()
+        for fen, _ in read_epd(DEFAULT_EPD):
+            board = Board(fen)
+            key = board.zobrist_key()
+            played = 0
+            for _ in range(20):
+                if not board.generate_moves(moves):
+                    break
+                board.push_state()
+                board.make_move_unrecorded(moves[rng.randrange(len(moves))])
+                self.assert_consistent(board)
+                played += 1
+            for _ in range(played):
+                board.pop_state()
+            self.assertEqual(board.get_fen(), fen)
+            self.assertEqual(board.zobrist_key(), key)
+
+
+class MoveLegalityTest(unittest.TestCase):
+    """Moves rejected by make_move() leave the position untouched."""
+
+    def test_invalid_squares(self) -> None:
+        fen = '4k2r/8/8/8/8/8/8/4K3 b - - 0 1'
+        board = Board(fen)
+        for from_str, to_str in (('zz', 'h5'), ('h8', 'zz'), ('e4', 'e5'), ('e1', 'e2')):
+            with self.subTest(move=from_str + to_str):
+                self.assertFalse(board._is_legal_move(board.alg_to_num(from_str),
+                                                      board.alg_to_num(to_str)))
+                board.make_move(board.alg_to_num(from_str), board.alg_to_num(to_str))
+                self.assertEqual(board.get_fen(), fen)
+                self.assertEqual(board._piece_lists, [[4], [60, 63]])
+        self.assertTrue(board._is_legal_move(board.alg_to_num('h8'), board.alg_to_num('h5')))
+
+
+class CaptureGenerationTest(unittest.TestCase):
+    """Capture-only generators against captures filtered from all legal moves."""
+
+    # En passant (with a pinned capturer in the second one) and promotions
+    # with and without captures
+    EXTRA_FENS = ('rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3',
+                  '8/8/8/K2pP2r/8/8/8/7k w - d6 0 1',
+                  'r3k3/1P6/8/8/8/8/6p1/4K2R b K - 0 1')
+
+    def expected_captures(self, board: Board) -> list:
+        """Return the legal captures and promotions, filtered from all legal moves."""
+
+        chessboard = board._chessboard
+        captures = []
+        for from_num, to_num in board.get_all_legal_moves():
+            is_pawn = chessboard[from_num] & TYPE_MASK == PAWN
+            if (chessboard[to_num] != EMPTY or 
+                    is_pawn and (to_num == board._ep_square or to_num // 8 in (0, 7))):
+                captures.append((from_num, to_num))
+        return sorted(captures)
+
+    def test_captures(self) -> None:
+        rng = random.Random(15)
+        moves = MoveList()
+        captures = MoveList()
+        fens = [fen for fen, _ in read_epd(DEFAULT_EPD)] + list(self.EXTRA_FENS)
+        checked = 0
+        for fen in fens:
+            board = Board(fen)
+            for _ in range(30):
+                with self.subTest(fen=board.get_fen()):
+                    expected = self.expected_captures(board)
+                    self.assertEqual(sorted(board.get_legal_captures()), expected)
+                    board.generate_moves(moves)
+                    board.generate_captures(captures)
+                    packed = sorted(move for move in moves
+                                    if (move & 63, move >> 6 & 63) in expected)
+                    self.assertEqual(sorted(captures), packed)
+                    checked += len(expected)
+                if not list(random_walk(board, rng, 1)):
+                    break
+        self.assertGreater(checked, 0)
+
+    def test_en_passant_and_promotions(self) -> None:
+        board = Board(self.EXTRA_FENS[0])
+        self.assertIn((board.alg_to_num('e5'), board.alg_to_num('f6')), board.get_legal_captures())
+        # The capturing pawn is pinned along the rank
+        board = Board(self.EXTRA_FENS[1])
+        self.assertEqual(board.get_legal_captures(), [])
+        board = Board(self.EXTRA_FENS[2])
+        captures = MoveList()
+        self.assertEqual(board.generate_captures(captures), 8)
+
+
+class DrawTest(unittest.TestCase):
+    """Repetition, fifty-move rule and insufficient material."""
+
+    def play(self, board: Board, moves: str) -> None:
+        """Make moves given in coordinate notation, e.g. 'g1f3 g8f6'."""
+
+        for move_str in moves.split():
+            board.make_move(board.alg_to_num(move_str[:2]), board.alg_to_num(move_str[2:]))
+
+    def test_threefold_repetition(self) -> None:
+        board = Board()
+        self.play(board, 'g1f3 g8f6 f3g1 f6g8 g1f3 g8f6 f3g1')
+        self.assertTrue(board.is_repetition(2))
+        self.assertFalse(board.is_repetition())
+        self.assertEqual(board.detect_game_end(), 0)
+        self.play(board, 'f6g8')
+        self.assertTrue(board.is_repetition())
+        self.assertFalse(board.is_repetition(4))
+        self.assertTrue(board.is_draw())
+        self.assertEqual(board.detect_game_end(), 4)
+        # Taking a move back undoes the repetition
+        board.unmake_move()
+        self.assertFalse(board.is_repetition())
+
+    def test_fifty_move_rule(self) -> None:
+        board = Board('4k3/8/8/8/8/8/8/R3K3 w - - 99 80')
+        self.assertFalse(board.is_draw())
+        self.play(board, 'a1a2')
+        self.assertTrue(board.is_draw())
+        self.assertEqual(board.detect_game_end(), 3)
+        board.unmake_move()
+        self.assertFalse(board.is_draw())
+
+    def test_insufficient_material(self) -> None:
+        for fen, drawn in (('4k3/8/8/8/8/8/8/4K3 w - - 0 1', True), # KvK
+                           ('4k3/8/8/8/8/8/8/2B1K3 w - - 0 1', True), # KBvK
+                           ('4k3/8/8/8/8/8/8/1N2K3 b - - 0 1', True), # KNvK
+                           ('2b1k3/8/8/8/8/8/8/2B1K3 w - - 0 1', False), # opposite bishops
+                           ('4kb2/8/8/8/8/8/8/2B1K3 w - - 0 1', True), # same-colour bishops
+                           ('4k3/8/8/8/8/8/8/1NN1K3 w - - 0 1', False), # two knights
+                           ('4k3/8/8/8/8/8/4P3/4K3 w - - 0 1', False),
+                           ('4k3/8/8/8/8/8/8/R3K3 w - - 0 1', False)):
+            with self.subTest(fen=fen):
+                board = Board(fen)
+                self.assertEqual(board.has_insufficient_material(), drawn)
+                self.assertEqual(board.detect_game_end(), 5 if drawn else 0)
+
+
+class CopyTest(unittest.TestCase):
+    """copy(), to_bytes()/from_bytes() and pickling of positions."""
+
+    def position(self) -> Board:
+        """
+        Return a board with a move history, an en passant square and
+        partial castling rights.
+        """
+        board = Board('r3k2r/pppppppp/8/8/8/8/PPPPPPPP/R3K2R w KQkq - 0 1')
+        for move_str in ('h1g1', 'a8b8', 'e2e4', 'b8a8', 'e4e5', 'd7d5'):
+            board.make_move(board.alg_to_num(move_str[:2]), board.alg_to_num(move_str[2:]))
+        return board
+
+    def assert_same_position(self, board: Board, other: Board) -> None:
+        """Check that two boards hold the same position and state."""
+
+        self.assertEqual(other.get_fen(), board.get_fen())
+        self.assertEqual(other.zobrist_key(), board.zobrist_key())
+        self.assertEqual(other.evaluate(), board.evaluate())
+        self.assertEqual(sorted(other.get_all_legal_moves()),
+                         sorted(board.get_all_legal_moves()))
+        self.assertEqual(other.perft(2), board.perft(2))
+        self.assertEqual(other._king_squares, board._king_squares)
+
+    def test_round_trips(self) -> None:
+        board = self.position()
+        self.assertEqual(board.get_fen(), 'r3k2r/ppp1pppp/8/3pP3/8/8/PPPP1PPP/R3K1R1 w Qk d6 0 4')
+        data = board.to_bytes()
+        self.assertEqual(len(data), 71)
+        for name, other in (('copy', board.copy()), ('bytes', Board.from_bytes(data)),
+                            ('pickle', pickle.loads(pickle.dumps(board)))):
+            with self.subTest(name=name):
+                self.assert_same_position(board, other)
+                self.assertEqual([sorted(p_list) for p_list in other._piece_lists],
+                                 [sorted(p_list) for p_list in board._piece_lists])
+                self.assertEqual(other._move_history, [])
+
+    def test_copy_is_independent(self) -> None:
+        board = self.position()
+        fen = board.get_fen()
+        other = board.copy()
+        other.make_move(board.alg_to_num('e5'), board.alg_to_num('d6'))
+        self.assertEqual(board.get_fen(), fen)
+        self.assertEqual(board.zobrist_key(), board._compute_zobrist_key())
+        other.unmake_move()
+        self.assertEqual(other.get_fen(), fen)
+        board.unmake_move()
+        self.assertEqual(board.get_fen(), 'r3k2r/pppppppp/8/4P3/8/8/PPPP1PPP/R3K1R1 b Qk - 0 3')
+
+
+if __name__ == '__main__':
+    unittest.main()
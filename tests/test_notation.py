@@ -0,0 +1,52 @@
+import unittest
+
+from ownchess.board import Board, MoveList
+from ownchess.notation import (move_to_san, moves_to_san, line_to_san, san_to_move,
+                               move_to_uci, uci_to_move)
+from ownchess.perftsuite import read_epd, DEFAULT_EPD
+
+
+class NotationTest(unittest.TestCase):
+    """SAN and UCI formatting and parsing of packed moves."""
+
+    def test_round_trips(self) -> None:
+        """Every legal move of the suite positions survives SAN and UCI round trips."""
+
+        board = Board()
+        moves = MoveList()
+        for fen, _ in read_epd(DEFAULT_EPD):
+            board.set_fen(fen)
+            board.generate_moves(moves)
+            sans = moves_to_san(board, moves)
+            for move, san in zip(moves, sans):
+                with self.subTest(fen=fen, san=san):
+                    self.assertEqual(move_to_san(board, move), san)
+                    self.assertEqual(san_to_move(board, san), move)
+                    self.assertEqual(uci_to_move(board, move_to_uci(move)), move)
+            self.assertEqual(board.get_fen(), fen)
+
+    def test_disambiguation(self) -> None:
+        board = Board('4k3/8/8/8/8/8/4K3/R6R w - - 0 1')
+        self.assertEqual(move_to_san(board, san_to_move(board, 'Rad1')), 'Rad1')
+        board = Board('4k3/8/8/N7/8/8/8/N3K3 w - - 0 1')
+        self.assertEqual(move_to_san(board, san_to_move(board, 'N1b3')), 'N1b3')
+        with self.assertRaises(ValueError):
+            san_to_move(board, 'Nb3')
+
+    def test_check_and_mate_suffixes(self) -> None:
+        board = Board()
+        line = [uci_to_move(board, move_str) for move_str in ('f2f3', 'e7e5', 'g2g4', 'd8h4')]
+        self.assertEqual(line_to_san(board, line), '1. f3 e5 2. g4 Qh4#')
+        self.assertEqual(board.get_fen(), Board.FEN_INIT)
+        board = Board('4k3/8/8/8/8/8/8/R3K3 w Q - 0 1')
+        self.assertEqual(move_to_san(board, uci_to_move(board, 'a1a8')), 'Ra8+')
+        self.assertEqual(move_to_san(board, uci_to_move(board, 'e1c1')), 'O-O-O')
+
+    def test_promotion(self) -> None:
+        board = Board('8/P6k/8/8/8/8/8/K7 w - - 0 1')
+        self.assertEqual(move_to_san(board, uci_to_move(board, 'a7a8q')), 'a8=Q')
+        self.assertEqual(move_to_uci(san_to_move(board, 'a8=N')), 'a7a8n')
+
+
+if __name__ == '__main__':
+    unittest.main()
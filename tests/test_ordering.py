@@ -0,0 +1,97 @@
+import unittest
+
+from ownchess.board import Board, MoveList
+from ownchess.notation import move_to_uci, uci_to_move
+from ownchess.ordering import (MoveOrderer, STAGE_HASH_MOVE, STAGE_CAPTURES,
+                               STAGE_KILLERS, STAGE_QUIET)
+from ownchess.search import Searcher
+
+
+# White queen on d4 can take a pawn (c5), a knight (e3) or a rook (d7);
+# the d2 pawn can take the knight too; the g7 pawn can promote
+POSITION = '4k3/3r2P1/8/2p5/3Q4/4n3/3P4/4K3 w - - 0 1'
+
+
+class MoveOrdererTest(unittest.TestCase):
+    """Search order of the moves and the killer and history updates."""
+
+    def setUp(self) -> None:
+        self.board = Board(POSITION)
+        self.moves = MoveList()
+        self.board.generate_moves(self.moves)
+        self.orderer = MoveOrderer(8)
+
+    def ordered(self, ply: int = 0, hash_move: int = 0) -> list:
+        """Return the moves of the position in search order, in UCI notation."""
+
+        return [move_to_uci(move) for move in
+                self.orderer.ordered_moves(self.board, self.moves, ply, hash_move)]
+
+    def move(self, move_str: str) -> int:
+        """Return a move of the position packed."""
+
+        return uci_to_move(self.board, move_str)
+
+    def test_all_moves_once(self) -> None:
+        self.assertEqual(sorted(self.ordered()), sorted(move_to_uci(move) for move in self.moves))
+
+    def test_hash_move_first(self) -> None:
+        ordered = self.ordered(hash_move=self.move('e1e2'))
+        self.assertEqual(ordered[0], 'e1e2')
+        self.assertEqual(ordered.count('e1e2'), 1)
+
+    def test_captures_by_mvv_lva(self) -> None:
+        ordered = self.ordered()
+        # Queen promotions (capturing nothing) count as winning a queen,
+        # then the rook, knight (the pawn taking first) and pawn captures
+        self.assertEqual(ordered[:5], ['g7g8q', 'd4d7', 'd2e3', 'd4e3', 'd4c5'])
+        # Under-promotions are quiet moves
+        self.assertIn('g7g8n', ordered[5:])
+
+    def test_killers_and_history(self) -> None:
+        quiet = self.move('d4a4')
+        self.orderer.record_cutoff(self.board, quiet, 1, 3, 5)
+        self.assertEqual(self.orderer._killers[1][0], quiet)
+        self.assertEqual(self.ordered(ply=1)[5], 'd4a4')
+        # Killers are only used at their own ply, the history everywhere
+        self.assertEqual(self.ordered(ply=2)[5], 'd4a4')
+        # Deeper cutoffs weigh more (depth squared)
+        self.orderer.record_cutoff(self.board, self.move('d4h4'), 2, 4, 0)
+        self.assertEqual(self.ordered(ply=3)[5:7], ['d4h4', 'd4a4'])
+
+        # Newest killer first, no duplicates
+        other = self.move('e1e2')
+        self.orderer.record_cutoff(self.board, other, 1, 1, 0)
+        self.orderer.record_cutoff(self.board, other, 1, 1, 0)
+        self.assertEqual(self.orderer._killers[1], [other, quiet])
+        self.assertEqual(self.ordered(ply=1)[5:7], ['e1e2', 'd4a4'])
+
+    def test_captures_are_not_killers(self) -> None:
+        self.orderer.record_cutoff(self.board, self.move('d4d7'), 1, 4, 0)
+        self.assertEqual(self.orderer._killers[1], [0, 0])
+        self.assertEqual(self.orderer.stage_cutoffs[STAGE_CAPTURES], 1)
+
+    def test_stage_statistics(self) -> None:
+        hash_move = self.move('e1e2')
+        self.orderer.record_cutoff(self.board, hash_move, 0, 1, 0, hash_move)
+        self.orderer.record_cutoff(self.board, self.move('d4a4'), 0, 1, 3)
+        self.orderer.record_cutoff(self.board, self.move('d4a4'), 0, 1, 0)
+        self.assertEqual(self.orderer.cutoffs, 3)
+        self.assertEqual(self.orderer.first_move_cutoffs, 2)
+        self.assertEqual([self.orderer.stage_cutoffs[stage] for stage in
+                          (STAGE_HASH_MOVE, STAGE_CAPTURES, STAGE_KILLERS, STAGE_QUIET)],
+                         [1, 0, 1, 1])
+
+
+class OrderingSearchTest(unittest.TestCase):
+    """Move ordering in the search."""
+
+    def test_fewer_nodes(self) -> None:
+        results = [Searcher(Board(Board.FEN_INIT), 1, ordering).search(3)
+                   for ordering in (True, False)]
+        self.assertEqual(results[0].score, results[1].score)
+        self.assertLess(results[0].nodes, results[1].nodes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+from ownchess.board import Board
+from ownchess.bitboard import BitBoard
+from ownchess.perftsuite import read_epd, run_suite, DEFAULT_EPD
+
+
+# Depth up to which every position of the suite is checked
+SUITE_DEPTH = 3
+
+# Position 3 of the suite, small enough for deeper checks
+POSITION_3 = '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1'
+
+
+class PerftTest(unittest.TestCase):
+    """Node counts of the perft variants against the EPD regression suite."""
+
+    def assert_suite_passes(self, **kwargs) -> None:
+        """Run the suite up to SUITE_DEPTH and check every node count."""
+
+        report = run_suite(DEFAULT_EPD, SUITE_DEPTH, verbose=False, **kwargs)
+        failed = [(result['fen'], result['depth']) for result in report['results']
+                  if not result['passed']]
+        self.assertEqual(failed, [])
+        self.assertGreater(report['runs'], 0)
+
+    def test_suite(self) -> None:
+        self.assert_suite_passes()
+
+    def test_suite_copy_make(self) -> None:
+        self.assert_suite_passes(copy_make=True)
+
+    def test_deeper(self) -> None:
+        board = Board(POSITION_3)
+        self.assertEqual(board.perft(5), 674624)
+        self.assertEqual(board.get_fen(), POSITION_3)
+
+    def test_hashed(self) -> None:
+        for copy_make in (False, True):
+            with self.subTest(copy_make=copy_make):
+                board = Board(POSITION_3)
+                self.assertEqual(board.perft(5, 1, copy_make), 674624)
+                self.assertGreater(board._perft_table.hits, 0)
+                self.assertEqual(board.get_fen(), POSITION_3)
+        # Too shallow to reach a transposition, so no table is used
+        self.assertEqual(board.perft(4, 1), 43238)
+        self.assertIsNone(board._perft_table)
+
+    def test_divide(self) -> None:
+        for fen, expected in read_epd(DEFAULT_EPD):
+            with self.subTest(fen=fen):
+                divided = Board(fen).divide(2)
+                self.assertEqual(sum(divided.values()), expected[2])
+                self.assertEqual(len(divided), expected[1])
+
+    def test_parallel(self) -> None:
+        """Parallel divide and perft equal the serial results."""
+
+        board = Board(POSITION_3)
+        divided = board.divide(3)
+        parallel = board.divide_parallel(3, 2)
+        self.assertEqual(parallel, divided)
+        self.assertEqual(list(parallel), list(divided))
+        # Fewer root moves than 4 per worker, so split one ply deeper
+        self.assertEqual(board.divide_parallel(3, 4), divided)
+        self.assertEqual(board.perft_parallel(3, 4), board.perft(3))
+        self.assertEqual(board.get_fen(), POSITION_3)
+
+    def test_bitboard(self) -> None:
+        """BitBoard agrees with Board on every suite position."""
+
+        for fen, expected in read_epd(DEFAULT_EPD):
+            bit_board = BitBoard(fen)
+            with self.subTest(fen=fen):
+                self.assertEqual(bit_board.divide(2), Board(fen).divide(2))
+                self.assertEqual(bit_board.perft(SUITE_DEPTH), expected[SUITE_DEPTH])
+                self.assertEqual(bit_board.get_fen(), Board(fen).get_fen())
+
+
+if __name__ == '__main__':
+    unittest.main()
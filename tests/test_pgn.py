@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+from ownchess.board import Board
+from ownchess.notation import uci_to_move
+from ownchess.pgn import read_games, replay_game, replay_games, export_game, san_moves
+
+
+class PgnTest(unittest.TestCase):
+    """Reading, replaying and exporting PGN games."""
+
+    def write_pgn(self, text: str) -> str:
+        """Write a temporary PGN file, removed after the test, and return its path."""
+
+        pgn_file = tempfile.NamedTemporaryFile('w', suffix='.pgn', delete=False)
+        with pgn_file:
+            pgn_file.write(text)
+        self.addCleanup(os.remove, pgn_file.name)
+        return pgn_file.name
+
+    def test_san_moves(self) -> None:
+        movetext = '1. e4 {best by test} e5 2. Nf3 (2. f4 exf4) Nc6 $1 3. Bb5 a6 1-0'
+        self.assertEqual(san_moves(movetext), ['e4', 'e5', 'Nf3', 'Nc6', 'Bb5', 'a6'])
+
+    def test_export_round_trip(self) -> None:
+        board = Board()
+        moves = []
+        for move_str in 'e2e4 d7d5 e4d5 g8f6 f1b5 c7c6 d5c6 d8a5 c6b7 a5b5 b7a8n'.split():
+            moves.append(uci_to_move(board, move_str))
+            board.make_packed_move(moves[-1], True)
+        final_fen = board.get_fen()
+        for _ in moves:
+            board.unmake_move()
+
+        text = export_game(board, moves, {'White': 'A "quoted" name', 'Black': 'B'})
+        (headers, movetext), = read_games(self.write_pgn(text))
+        self.assertEqual(headers['White'], 'A "quoted" name')
+        result = replay_game(Board(), headers, movetext)
+        self.assertEqual(result.error, '')
+        self.assertEqual(result.plies, len(moves))
+        self.assertEqual(result.final_fen, final_fen)
+
+    def test_game_without_movetext(self) -> None:
+        path = self.write_pgn('[Event "First"]\n[Result "*"]\n\n'
+                              '[Event "Second"]\n\n1. e4 e5 *\n')
+        games = list(read_games(path))
+        self.assertEqual([headers['Event'] for headers, _ in games], ['First', 'Second'])
+        self.assertEqual(games[0][1], '')
+        self.assertNotIn('Result', games[1][0])
+
+    def test_impossible_setup(self) -> None:
+        path = self.write_pgn('[FEN "8/8/8/8/8/8/4P3/4K3 w - - 0 1"]\n\n1. e4 *\n\n'
+                              '[FEN "4k3/8/8/8/8/8/8/4RK2 w - - 0 1"]\n\n1. Kg2 *\n\n'
+                              '[FEN "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1"]\n\n1. e4 *\n')
+        results = list(replay_games(path))
+        self.assertIn('0 black kings', results[0].error)
+        self.assertIn('side not to move in check', results[1].error)
+        self.assertEqual(results[0].plies, 0)
+        self.assertEqual(results[2].error, '')
+        self.assertEqual(results[2].plies, 1)
+
+    def test_impossible_castling_and_pawns(self) -> None:
+        path = self.write_pgn('[FEN "4k3/8/8/8/8/8/8/4K3 w KQkq - 0 1"]\n\n1. O-O *\n\n'
+                              '[FEN "r3k3/8/8/8/8/8/8/4K2R w Kq - 0 1"]\n\n1. O-O O-O-O *\n\n'
+                              '[FEN "4k3/8/8/8/8/8/8/3PK3 w - - 0 1"]\n\n1. Kf2 *\n\n'
+                              '[FEN "3Pk3/8/8/8/8/8/8/4K3 b - - 0 1"]\n\n1... Kf7 *\n')
+        results = list(replay_games(path))
+        self.assertIn('castling right K', results[0].error)
+        self.assertEqual(results[0].plies, 0)
+        self.assertEqual(results[1].error, '')
+        self.assertEqual(results[1].plies, 2)
+        for result in results[2:]:
+            self.assertIn('pawn on the first or eighth rank', result.error)
+            self.assertEqual(result.plies, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from ownchess.board import Board
+from ownchess.notation import uci_to_move
+from ownchess.polyglot import polyglot_key, RANDOM64_SIZE, DEFAULT_RANDOM64
+
+
+class PolyglotKeyTest(unittest.TestCase):
+    """Keys of the default Random64 table against the Polyglot book format examples."""
+
+    def key_after(self, moves: str) -> int:
+        """Return the Polyglot key of the position after UCI moves from the start."""
+
+        board = Board()
+        for move_str in moves.split():
+            board.make_packed_move(uci_to_move(board, move_str), True)
+        return polyglot_key(board)
+
+    def test_table_size(self) -> None:
+        self.assertEqual(len(DEFAULT_RANDOM64), RANDOM64_SIZE)
+
+    def test_start_position(self) -> None:
+        self.assertEqual(self.key_after(''), 0x463b96181691fc9c)
+
+    def test_after_e4(self) -> None:
+        self.assertEqual(self.key_after('e2e4'), 0x823c9b50fd114196)
+
+    def test_en_passant_and_castling_rights(self) -> None:
+        self.assertEqual(self.key_after('e2e4 d7d5 e4e5 f7f5'), 0x22a48b5a8e47ff78)
+        self.assertEqual(self.key_after('e2e4 d7d5 e4e5 f7f5 e1e2 e8f7'), 0x00fdd303c946bdd9)
+        self.assertEqual(self.key_after('a2a4 b7b5 h2h4 b5b4 c2c4 b4c3 a1a3'), 0x5c3f9b829b279560)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import io
+import unittest
+from unittest import mock
+
+from ownchess.board import Board
+from ownchess.cli import interactive_mode
+from ownchess.profiling import Instrumentation, INSTRUMENTED_METHODS
+
+
+class InstrumentationTest(unittest.TestCase):
+    """Call counting of the hot path methods during a shallow perft."""
+
+    def test_perft_report(self) -> None:
+        board = Board()
+        with Instrumentation(Board) as instrumentation:
+            nodes = board.perft(2)
+        self.assertEqual(nodes, 400)
+        stats = instrumentation.stats()
+        self.assertEqual(set(stats), set(INSTRUMENTED_METHODS))
+        # One generation at the root, the leaves are only counted
+        self.assertEqual(stats['generate_moves'][0], 1)
+        self.assertEqual(stats['_count_child_moves'][0], 20)
+        self.assertEqual(stats['_move_piece'][0], stats['_unmove_piece'][0])
+        self.assertGreater(stats['_get_legal_targets'][0], 0)
+
+        report = instrumentation.report(nodes, 1.0)
+        self.assertIn('Per node', report.splitlines()[0])
+        for name in ('generate_moves', '_count_child_moves', '_get_legal_targets'):
+            self.assertIn(name, report)
+
+    def test_disable_restores_methods(self) -> None:
+        original = Board.__dict__['generate_moves']
+        with Instrumentation(Board):
+            self.assertIsNot(Board.__dict__['generate_moves'], original)
+        self.assertIs(Board.__dict__['generate_moves'], original)
+        self.assertEqual(Board().perft(1), 20)
+
+    def test_cli_command(self) -> None:
+        output = io.StringIO()
+        with mock.patch('builtins.input', side_effect=['prof 2', 'q']), \
+                mock.patch('sys.stdout', output):
+            interactive_mode(Board())
+        self.assertIn('Nodes: 400', output.getvalue())
+        self.assertIn('_count_child_moves', output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from ownchess.board import Board
+from ownchess.notation import move_to_uci
+from ownchess.search import Searcher, MATE_SCORE
+
+
+KIWIPETE = 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1'
+
+
+class SearcherTest(unittest.TestCase):
+    """Alpha-beta search results on small positions."""
+
+    def search(self, fen: str, depth: int, **kwargs):
+        """Search a position, checking that the board is left unchanged."""
+
+        board = Board(fen)
+        result = Searcher(board, 1, **kwargs).search(depth)
+        self.assertEqual(board.get_fen(), fen)
+        self.assertEqual(board.zobrist_key(), board._compute_zobrist_key())
+        return result
+
+    def test_mate_in_one(self) -> None:
+        result = self.search('6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1', 3)
+        self.assertEqual(move_to_uci(result.best_move), 'a1a8')
+        self.assertEqual(result.score, MATE_SCORE - 1)
+        self.assertEqual(result.depth, 1)
+
+    def test_mated(self) -> None:
+        result = self.search('R5k1/5ppp/8/8/8/8/8/6K1 b - - 0 1', 2)
+        self.assertEqual(result.best_move, 0)
+        self.assertEqual(result.score, -MATE_SCORE)
+
+    def test_wins_material(self) -> None:
+        # Undefended queen
+        result = self.search('4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1', 2)
+        self.assertEqual(move_to_uci(result.best_move), 'd2d5')
+        self.assertGreater(result.score, 0)
+
+    def test_draw_scores(self) -> None:
+        # A bishop up, but no mating material
+        self.assertEqual(self.search('4k3/8/8/8/8/8/8/2B1K3 w - - 0 1', 3).score, 0)
+        # A queen up, but every move reaches the fifty-move rule
+        self.assertGreater(self.search('k7/8/8/8/8/8/8/1Q4K1 w - - 0 80', 2).score, 0)
+        self.assertEqual(self.search('k7/8/8/8/8/8/8/1Q4K1 w - - 99 80', 2).score, 0)
+
+    def test_copy_make_matches(self) -> None:
+        for fen in (Board.FEN_INIT, KIWIPETE):
+            with self.subTest(fen=fen):
+                make_unmake = self.search(fen, 3)
+                copy_make = self.search(fen, 3, copy_make=True)
+                self.assertEqual(copy_make.best_move, make_unmake.best_move)
+                self.assertEqual(copy_make.score, make_unmake.score)
+                self.assertEqual(copy_make.nodes, make_unmake.nodes)
+                self.assertEqual(copy_make.pv, make_unmake.pv)
+
+
+if __name__ == '__main__':
+    unittest.main()
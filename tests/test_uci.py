@@ -0,0 +1,68 @@
+import io
+import unittest
+
+from ownchess.board import Board
+from ownchess.uci import UciEngine
+
+
+class UciEngineTest(unittest.TestCase):
+    """Command handling of the UCI front end, with output captured."""
+
+    def setUp(self) -> None:
+        self.output = io.StringIO()
+        self.engine = UciEngine(self.output)
+
+    def lines(self) -> list:
+        """Return the lines written by the engine so far."""
+
+        return self.output.getvalue().splitlines()
+
+    def test_uci_handshake(self) -> None:
+        self.assertTrue(self.engine.handle('uci'))
+        self.assertEqual(self.lines()[0], f'id name {UciEngine.NAME}')
+        self.assertEqual(self.lines()[-1], 'uciok')
+
+    def test_quit(self) -> None:
+        self.assertFalse(self.engine.handle('quit'))
+
+    def test_hash_option(self) -> None:
+        self.engine.handle('setoption name Hash value 2')
+        self.assertEqual(self.engine._hash_mb, 2)
+        self.engine.handle('setoption name Hash value 0')
+        self.assertEqual(self.engine._hash_mb, UciEngine.HASH_MIN)
+
+    def test_invalid_hash_option(self) -> None:
+        for line in ('setoption name Hash value abc', 'setoption name Hash'):
+            self.assertTrue(self.engine.handle(line))
+            self.assertTrue(self.lines()[-1].startswith('info string Invalid value for Hash'))
+        self.assertEqual(self.engine._hash_mb, UciEngine.HASH_DEFAULT)
+
+    def test_position_moves(self) -> None:
+        self.engine.handle('position startpos moves e2e4 e7e5 g1f3')
+        self.assertEqual(self.engine._board.get_fen(),
+                         'rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2')
+
+    def test_illegal_position_move(self) -> None:
+        self.engine.handle('position startpos moves e2e5')
+        self.assertEqual(self.lines()[-1], 'info string Illegal move: e2e5')
+
+    def test_invalid_fen(self) -> None:
+        self.engine.handle('position startpos moves e2e4')
+        for fen in ('8/8 w', 'xx w - - 0 1', '4k3/8/8/8/8/8/8/4K3 w - - x 1'):
+            with self.subTest(fen=fen):
+                self.assertTrue(self.engine.handle(f'position fen {fen} moves e1e2'))
+                self.assertEqual(self.lines()[-1], f'info string Invalid FEN: {fen}')
+                self.assertEqual(self.engine._board.get_fen(), Board.FEN_INIT)
+        self.assertTrue(self.engine.handle('isready'))
+        self.assertEqual(self.lines()[-1], 'readyok')
+
+    def test_go_depth(self) -> None:
+        self.engine.handle('position startpos')
+        self.engine.handle('go depth 2')
+        self.engine.handle('stop')
+        self.assertTrue(self.lines()[-1].startswith('bestmove '))
+        self.assertNotEqual(self.lines()[-1], 'bestmove 0000')
+
+
+if __name__ == '__main__':
+    unittest.main()